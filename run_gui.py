@@ -3,11 +3,11 @@
 
 import sys
 import os
-from pathlib import Path
 
-# Add src to Python path
-src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
+from src._bootstrap import bootstrap
+
+# Add src to Python path (once)
+bootstrap()
 
 os.environ['TK_SILENCE_DEPRECATION'] = '1'
 
@@ -5,12 +5,11 @@ Menu bar application launcher
 
 import sys
 import os
-from pathlib import Path
 
-# Add src to Python path
-current_dir = Path(__file__).parent
-src_path = current_dir / "src"
-sys.path.insert(0, str(src_path))
+from src._bootstrap import bootstrap, SRC_DIR
+
+# Add src to Python path (once)
+bootstrap()
 
 def main():
     """Launch the menu bar application"""
@@ -24,9 +23,8 @@ def main():
     except ImportError as e:
         print(f"Import error: {e}")
         print("Available modules in src:")
-        src_dir = Path(__file__).parent / "src"
-        if src_dir.exists():
-            for item in src_dir.iterdir():
+        if os.path.isdir(SRC_DIR):
+            for item in os.scandir(SRC_DIR):
                 if item.is_dir() and not item.name.startswith('__'):
                     print(f"  - {item.name}/")
         else:
@@ -0,0 +1,21 @@
+"""
+Post-install step - precompile src/ to bytecode
+Run once after installing dependencies so the launchers don't parse sources on first start
+"""
+
+import sys
+import compileall
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+
+def main():
+    """Compile every module under src/ into __pycache__"""
+    # workers=0 uses one process per CPU; the default (non-legacy) layout writes
+    # __pycache__/*.pyc, which the import system picks up next to the .py sources
+    ok = compileall.compile_dir(str(SRC_DIR), quiet=1, workers=0)
+    print("✅ Bytecode precompiled" if ok else "⚠️  Some modules failed to compile")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,4 +22,8 @@ echo "⬇️  Installing dependencies..."
 pip install --upgrade pip
 pip install -r setup/requirements.txt
 
+# Precompile bytecode so the launchers skip source parsing on first start
+echo "⚙️  Precompiling Python sources..."
+python setup/postinstall.py
+
 echo "✅ Environment setup complete!"
@@ -0,0 +1,22 @@
+"""
+Launcher bootstrap shared by the run_*.py scripts
+"""
+
+import os
+import sys
+
+# Resolved once so './src' and absolute spellings compare equal
+SRC_DIR = os.path.dirname(os.path.realpath(__file__))
+
+def bootstrap():
+    """Add src to the Python path unless it is already there and set math library threading"""
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+
+    # App directories exist before any log file or database is opened
+    from src.config.settings import config
+    config.ensure_directories()
+
+    # Must run before numpy/pandas are imported - BLAS reads these at load time
+    from src.core.apple_silicon_optimizer import optimizer
+    optimizer.configure_environment()
@@ -4,21 +4,48 @@ This file will create the paths and directories used in the app also it will det
 """
 
 import os
+import platform
+import functools
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional
-import subprocess
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+
+@functools.lru_cache(maxsize=1)
+def _detect_apple_silicon() -> bool:
+    """Detect if running on Apple Silicon (cached, the machine type never changes at runtime)"""
+    return platform.machine() == 'arm64'
+
+def _effective_cpu_count() -> int:
+    """CPUs this process may run on - respects affinity masks, unlike os.cpu_count()"""
+    process_cpu_count = getattr(os, 'process_cpu_count', None)  # Python 3.13+
+    if process_cpu_count is not None:
+        count = process_cpu_count()
+    elif hasattr(os, 'sched_getaffinity'):  # Linux
+        count = len(os.sched_getaffinity(0))
+    else:
+        count = os.cpu_count()
+    return count or 4
+
+# Resolved once per process
+EFFECTIVE_CPU_COUNT = _effective_cpu_count()
+
+# Project root (three levels up from src/config/settings.py), computed once with os.path
+BASE_DIR = Path(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Marker written into DB_DIR once the app directories exist, so later starts need one access() check
+DIRS_MARKER = '.dirs_ok'
 
 @dataclass
 class AppConfig:
     """Main application configuration"""
     
     # Paths
-    BASE_DIR: Path = Path(__file__).parent.parent.parent
+    BASE_DIR: Path = BASE_DIR
     DATA_DIR: Path = BASE_DIR / "data"
     DB_DIR: Path = DATA_DIR / "db" 
     LOGS_DIR: Path = BASE_DIR / "logs"
+    CACHE_DIR: Path = BASE_DIR / ".cache"  # Regenerable downloads/state, safe to delete
     
     # Database
     DB_NAME: str = "historical_data.db"  
@@ -27,7 +54,7 @@ class AppConfig:
     # Data source
     COMPANIES_CSV: Path = DATA_DIR / "stock_list.csv"  
     START_DATE: str = "2010-01-01"
-    END_DATE: str = (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d')  # Dynamic end date - YESTERDAY
+    END_DATE: Optional[str] = None  # None = dynamic end date, see end_date property
     # Update settings  
     UPDATE_SCHEDULE_WEEKDAY: int = 0  # Sunday
     UPDATE_SCHEDULE_HOUR: int = 9
@@ -35,6 +62,7 @@ class AppConfig:
     
     # Performance
     CHUNK_SIZE: int = 500 #yfinance has a rate limit of 500-1000 stocks this avoids failure for larger requests, also helps in RAM optimization, different then the chunk_size in database manager
+    DOWNLOAD_BATCH_SIZE: int = 50 #symbols per yf.download call, one HTTP batch instead of one request per symbol
     MAX_WORKERS: Optional[int] = None
     
     # GUI settings
@@ -43,15 +71,15 @@ class AppConfig:
     THEME: str = "dark"
     
     def __post_init__(self):
-        """Initialize computed values and create directories"""
+        """Initialize computed values (directories are created by ensure_directories, not on import)"""
         
-        # Create directories
-        for directory in [self.DATA_DIR, self.DB_DIR, self.LOGS_DIR]:
-            directory.mkdir(parents=True, exist_ok=True)
-            
+        # Dynamic end date cache, recomputed when the calendar day changes
+        self._end_date = None
+        self._end_date_day = None
+
         # Detect hardware and set optimal worker count
-        self.is_apple_silicon = self._detect_apple_silicon()
-        self.cpu_count = os.cpu_count() or 4
+        self.is_apple_silicon = _detect_apple_silicon()
+        self.cpu_count = EFFECTIVE_CPU_COUNT
         
         if self.MAX_WORKERS is None:
             if self.is_apple_silicon:
@@ -59,19 +87,40 @@ class AppConfig:
             else:
                 self.MAX_WORKERS = min(self.cpu_count, 8)
     
-    def _detect_apple_silicon(self) -> bool:
-        """Detect if running on Apple Silicon"""
-        try:
-            result = subprocess.run(['uname', '-m'], 
-                                  capture_output=True, text=True)
-            return result.stdout.strip() == 'arm64'
-        except(subprocess.SubprocessError, FileNotFoundError, OSError):
-            return False
-    
+    def ensure_directories(self):
+        """Create the app directories - data dirs are skipped once the marker exists, LOGS_DIR is always checked"""
+        marker = self.DB_DIR / DIRS_MARKER
+        if not os.access(marker, os.F_OK):
+            for directory in [self.DATA_DIR, self.DB_DIR]:
+                directory.mkdir(parents=True, exist_ok=True)
+            try:
+                marker.touch()
+            except OSError:
+                pass  # Read-only location - directories are checked again next start
+
+        self.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def end_date(self) -> str:
+        """Fetch end date - END_DATE if set, otherwise two days before today (cached per day)"""
+        if self.END_DATE is not None:
+            return self.END_DATE
+
+        today = date.today()
+        if self._end_date_day != today:
+            self._end_date = (today - timedelta(days=2)).strftime('%Y-%m-%d')
+            self._end_date_day = today
+        return self._end_date
+
     @property
     def db_url(self) -> str:
         """SQLAlchemy database URL"""
         return f"sqlite:///{self.DB_PATH}"
 
+@functools.lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    """Shared AppConfig instance - use this instead of constructing AppConfig() again"""
+    return AppConfig()
+
 # Global config instance
-config = AppConfig()
\ No newline at end of file
+config = get_config()
\ No newline at end of file
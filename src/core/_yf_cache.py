@@ -0,0 +1,217 @@
+"""
+On-disk cache for yfinance history responses
+Rows that are two or more days old get no new bars or revisions, so each symbol's settled rows are
+kept in one parquet file together with the date range they cover. Any window inside that range is
+sliced from the file; for other windows only the uncovered part is downloaded and merged in.
+Anything more recent is always fetched live. Adjusted prices are still recomputed by yfinance after
+every split or dividend, so a full refresh clears the cache instead of reusing it.
+"""
+
+import os
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import pandas as pd
+
+from ..config.settings import config
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_DIR = config.CACHE_DIR / "yfinance"
+
+# Parquet schema metadata keys holding the covered window [start, end) and the adjust mode
+_COVERED_START = b'covered_start'
+_COVERED_END = b'covered_end'
+_AUTO_ADJUST = b'auto_adjust'
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False  # Caching is disabled without the parquet engine
+
+def immutable_cutoff() -> str:
+    """Latest (exclusive) end date whose window is final - today minus two days"""
+    return (date.today() - timedelta(days=2)).strftime('%Y-%m-%d')
+
+def is_cacheable(end: str) -> bool:
+    """Whether a window ending at `end` can be cached"""
+    return PARQUET_AVAILABLE and end <= immutable_cutoff()
+
+def naive_dates(data: pd.DataFrame) -> pd.DataFrame:
+    """History frame with its Date index as exchange-local calendar dates (timezone dropped)"""
+    if getattr(data.index, 'tz', None) is not None:
+        data = data.set_axis(data.index.tz_localize(None))
+    return data
+
+def _cache_path(symbol: str, auto_adjust: bool) -> Path:
+    """Cache file for one symbol - .cache/yfinance/{adjusted|raw}/{symbol}.parquet"""
+    return CACHE_DIR / ('adjusted' if auto_adjust else 'raw') / f"{symbol}.parquet"
+
+def _covered_range(path: Path, auto_adjust: bool) -> Optional[Tuple[str, str]]:
+    """Window [start, end) held by a cache file (footer read only), None if there is no usable file"""
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable cache file {path}: {e}")
+        return None
+
+    if _COVERED_START not in metadata or _COVERED_END not in metadata:
+        return None
+    if metadata.get(_AUTO_ADJUST) != str(auto_adjust).encode():
+        return None  # Written with the other adjust mode - prices are on a different basis
+    return metadata[_COVERED_START].decode(), metadata[_COVERED_END].decode()
+
+def _read(path: Path) -> Optional[pd.DataFrame]:
+    """All cached rows of one symbol, None if the file can't be read"""
+    try:
+        return pq.read_table(path).to_pandas()
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable cache file {path}: {e}")
+        return None
+
+def _slice(data: pd.DataFrame, start: str, end: str) -> pd.DataFrame:
+    """Rows dated within [start, end) of a sorted history frame"""
+    lo, hi = data.index.searchsorted([pd.Timestamp(start), pd.Timestamp(end)])
+    return data.iloc[lo:hi]
+
+def load(symbol: str, start: str, end: str, auto_adjust: bool = True,
+         partial: bool = False) -> Optional[pd.DataFrame]:
+    """
+    Load a window from the symbol's cached rows
+
+    Args:
+        partial: Return the cached rows even if the cache covers only part of the window
+
+    Returns:
+        The rows dated within [start, end), or None when the cache doesn't cover the whole
+        window (any of it with partial) or the window isn't cacheable
+    """
+    if not is_cacheable(end):
+        return None
+
+    path = _cache_path(symbol, auto_adjust)
+    covered = _covered_range(path, auto_adjust)
+    if covered is None or (not partial and (start < covered[0] or end > covered[1])):
+        return None
+
+    data = _read(path)
+    if data is None:
+        return None
+
+    logger.debug(f"Cache hit for {symbol} ({start} to {end})")
+    return _slice(data, start, end)
+
+def missing_range(symbol: str, start: str, end: str, auto_adjust: bool = True) -> Optional[Tuple[str, str]]:
+    """
+    Part of the window [start, end) that has to be downloaded
+
+    Returns:
+        None when the cache covers the whole window, the uncovered part when it lies on one
+        side of the cached range, otherwise the whole window
+    """
+    if not is_cacheable(end):
+        return start, end
+
+    covered = _covered_range(_cache_path(symbol, auto_adjust), auto_adjust)
+    if covered is None:
+        return start, end
+
+    covered_start, covered_end = covered
+    if end < covered_start or start > covered_end:
+        return start, end  # Disjoint - the gap in between would be unknown
+
+    missing_before = start < covered_start
+    missing_after = end > covered_end
+    if missing_before and missing_after:
+        return start, end
+    if missing_before:
+        return start, covered_start
+    if missing_after:
+        return covered_end, end
+    return None
+
+def store(symbol: str, start: str, end: str, data: pd.DataFrame, auto_adjust: bool = True) -> bool:
+    """
+    Merge a downloaded window [start, end) into the symbol's cache file
+
+    The file keeps one contiguous covered range - a window touching it extends it, any other
+    window replaces it. Failures only cost the cache entry.
+
+    Returns:
+        True if the cache now covers the window
+    """
+    if data.empty or not is_cacheable(end):
+        return False
+
+    path = _cache_path(symbol, auto_adjust)
+    data = naive_dates(data)
+
+    covered = _covered_range(path, auto_adjust)
+    if covered is not None and start <= covered[1] and end >= covered[0]:
+        cached = _read(path)
+        if cached is not None:
+            data = pd.concat([cached, data])
+            data = data[~data.index.duplicated(keep='last')]  # Fresh download wins on overlap
+            start, end = min(start, covered[0]), max(end, covered[1])
+    data = data.sort_index()
+
+    tmp_path = path.with_suffix('.parquet.tmp')
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(data)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_COVERED_START] = start.encode()
+        metadata[_COVERED_END] = end.encode()
+        metadata[_AUTO_ADJUST] = str(auto_adjust).encode()
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        os.replace(tmp_path, path)  # Readers never see a half-written file
+    except Exception as e:
+        logger.debug(f"Could not cache {symbol} ({start} to {end}): {e}")
+        return False
+    return True
+
+def clear():
+    """Drop every cached file - the next downloads start a fresh cache on the current price basis"""
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+def combine(symbol: str, start: str, end: str, fetch_range: Tuple[str, str],
+            data: pd.DataFrame, auto_adjust: bool = True) -> Optional[pd.DataFrame]:
+    """
+    Rows of the window [start, end) once fetch_range (from missing_range) has been downloaded
+
+    The download is stored, and when it is only one side of the window the cached rows
+    of the other side are added (an empty download means nothing traded in the gap).
+
+    Returns:
+        The window's rows, or None when the cached part can't be read
+    """
+    if fetch_range == (start, end):
+        store(symbol, start, end, data, auto_adjust)
+        return naive_dates(data)
+
+    cached = load(symbol, start, end, auto_adjust, partial=True)
+    if cached is None:
+        return None
+    if data.empty:
+        return cached
+
+    store(symbol, fetch_range[0], fetch_range[1], data, auto_adjust)
+    return pd.concat([cached, naive_dates(data)]).sort_index()
+
+def fetch(symbol: str, start: str, end: str, download: Callable[[str, str], pd.DataFrame],
+          auto_adjust: bool = True) -> pd.DataFrame:
+    """History for [start, end) - cached rows plus a download(start, end) of only the uncovered part"""
+    data = load(symbol, start, end, auto_adjust)
+    if data is not None:
+        return data
+
+    fetch_range = missing_range(symbol, start, end, auto_adjust) or (start, end)
+    data = combine(symbol, start, end, fetch_range, download(*fetch_range), auto_adjust)
+    return data if data is not None else naive_dates(download(start, end))
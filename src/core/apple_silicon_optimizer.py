@@ -3,21 +3,34 @@ Apple Silicon specific optimizations
 """
 
 import os
-import psutil
-import subprocess
-from typing import Dict, Any
-from ..config.settings import config
+import platform
+import functools
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
+from ..config.settings import config, EFFECTIVE_CPU_COUNT
+
+@functools.lru_cache(maxsize=1)
+def _total_memory_bytes() -> int:
+    """Physical RAM in bytes, read once via sysconf (no psutil import needed)"""
+    return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
 
 class AppleSiliconOptimizer:
     """Hardware-specific optimizations for Apple Silicon"""
     
     def __init__(self):
         self.is_apple_silicon = config.is_apple_silicon
-        self.cpu_count = config.cpu_count
-        self.memory_gb = psutil.virtual_memory().total / (1024**3) # Identifies how much RAM is availabe in the system
+        self.cpu_count = EFFECTIVE_CPU_COUNT
+        self.memory_gb = _total_memory_bytes() / (1024**3) # Identifies how much RAM is availabe in the system
+
+        # Hardware doesn't change at runtime - build the settings once, read-only view
+        self._optimal_settings = MappingProxyType(self._build_optimal_settings())
         
-    def get_optimal_settings(self) -> Dict[str, Any]:
-        """Get optimal settings based on hardware"""
+    def get_optimal_settings(self) -> Mapping[str, Any]:
+        """Get optimal settings based on hardware (precomputed, read-only)"""
+        return self._optimal_settings
+
+    def _build_optimal_settings(self) -> Dict[str, Any]:
+        """Build optimal settings based on hardware"""
         
         base_settings = {
             'max_workers': config.MAX_WORKERS,
@@ -49,35 +62,34 @@ class AppleSiliconOptimizer:
         return base_settings
     
     def configure_environment(self):
-        """Set environment variables for optimal performance"""
+        """
+        Set environment variables for optimal performance
+
+        BLAS/NumExpr read these when numpy is first imported, so this runs from the
+        launcher bootstrap before pandas/numpy load. Values already set in the
+        environment are left alone.
+        """
         
         if self.is_apple_silicon:
+            cpu_count = str(self.cpu_count)
+
             # Optimize for Apple Silicon
-            os.environ['OPENBLAS_NUM_THREADS'] = str(self.cpu_count) #Controls OpenBLAS library threading
-            os.environ['MKL_NUM_THREADS'] = str(self.cpu_count) #Controls Intel Math Kernel Library threading
-            os.environ['VECLIB_MAXIMUM_THREADS'] = str(self.cpu_count) #Controls Apple's vector library threading
-            os.environ['NUMEXPR_NUM_THREADS'] = str(self.cpu_count) #Controls NumExpr library threading
+            os.environ.setdefault('OPENBLAS_NUM_THREADS', cpu_count) #Controls OpenBLAS library threading
+            os.environ.setdefault('MKL_NUM_THREADS', cpu_count) #Controls Intel Math Kernel Library threading
+            os.environ.setdefault('VECLIB_MAXIMUM_THREADS', cpu_count) #Controls Apple's vector library threading
+            os.environ.setdefault('NUMEXPR_NUM_THREADS', cpu_count) #Controls NumExpr library threading
             
             # Use Accelerate framework
-            os.environ['BLAS'] = 'Accelerate' #Tell math libraries to use Apple's optimized BLAS, BLAS: Basic Linear Algebra Subprograms, Accelerate: Apple's highly optimized math library for M-series chips
-            os.environ['LAPACK'] = 'Accelerate' #Tell math libraries to use Apple's optimized LAPACK, LAPACK: Linear Algebra Package (more advanced than BLAS)
+            os.environ.setdefault('BLAS', 'Accelerate') #Tell math libraries to use Apple's optimized BLAS, BLAS: Basic Linear Algebra Subprograms, Accelerate: Apple's highly optimized math library for M-series chips
+            os.environ.setdefault('LAPACK', 'Accelerate') #Tell math libraries to use Apple's optimized LAPACK, LAPACK: Linear Algebra Package (more advanced than BLAS)
         
     def get_system_info(self) -> Dict[str, Any]:
         """Get detailed system information"""
         
-        try:
-            # Get macOS version
-            #Runs the shell command sw_vers -productVersion
-            #sw_vers: macOS command that shows system version
-            #-productVersion: Flag to get just the version number
-            #capture_output=True: Capture the command output
-            #text=True: Return output as string (not bytes)
-            
-            macos_version = subprocess.run(['sw_vers', '-productVersion'], 
-                                         capture_output=True, text=True)
-            macos_version = macos_version.stdout.strip() #.stdout: Standard output from the command
-        except:
-            macos_version = "Unknown"
+        # Get macOS version
+        #platform.mac_ver() reads the version from the system plist in-process,
+        #no need to spawn sw_vers. Returns an empty string when not on macOS
+        macos_version = platform.mac_ver()[0] or "Unknown"
             
         return {
             'architecture': 'Apple Silicon' if self.is_apple_silicon else 'Intel',
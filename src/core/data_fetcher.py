@@ -3,126 +3,263 @@ Optimized stock data fetching with robust timezone handling
 Data Flow:
 
 1.)Load symbols from CSV
-2.)Submit parallel tasks to thread pool
-3.)Process completed tasks as they finish
-4.)Combine all data into single DataFrame
-5.)Store in database using chunked insertion
-6.)Return comprehensive results
+2.)Group symbols by date range and submit batched downloads to thread pool
+3.)Process completed batches as they finish
+4.)Store each completed batch in database using chunked insertion
+5.)Return comprehensive results
 """
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
+from pandas.api.types import is_numeric_dtype
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional, Tuple
+import os
+import json
 import time
+import queue
+import threading
 from datetime import datetime, timedelta
 
 from ..config.settings import config
-from .apple_silicon_optimizer import optimizer
 from ..utils.logger import get_logger
+from . import _yf_cache
 
 logger = get_logger(__name__)
 
+# yf.download resets and fills module-level dicts (yfinance.shared._DFS/_ERRORS) on every call, so two
+# overlapping calls drop or mix up each other's symbols - any count above one is unsafe, hence a plain
+# lock rather than a rate-limit-sized semaphore. Requests still run in parallel: threads=True fetches a
+# batch's symbols concurrently inside the call, and the pool overlaps cache reads and formatting with it
+_download_lock = threading.Lock()
+
+# Latest stored date per ticker from the last incremental run, lets warm runs plan without a DB query
+FETCHER_STATE_FILE = config.CACHE_DIR / 'fetcher_state.json'
+
+def _db_mtime_ns() -> Optional[int]:
+    """Last modification of the database (main file or WAL), None if it doesn't exist"""
+    try:
+        mtime = os.stat(config.DB_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    try:
+        mtime = max(mtime, os.stat(f"{config.DB_PATH}-wal").st_mtime_ns)
+    except FileNotFoundError:
+        pass
+    return mtime
+
+def _load_fetcher_state(tickers: List[str], data_version: Optional[int]) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Latest dates from the sidecar, if it is still valid for these tickers
+
+    Args:
+        data_version: The database's current write counter (db_manager.get_data_version())
+
+    Returns:
+        {ticker: latest_date}, or None when the sidecar is missing, was written at another
+        data version (something wrote to the database since), or doesn't cover every ticker
+    """
+    if data_version is None:
+        return None
+
+    try:
+        with open(FETCHER_STATE_FILE, 'r') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.debug(f"Ignoring unreadable fetcher state: {e}")
+        return None
+
+    if state.get('data_version') != data_version:
+        return None
+
+    latest_dates = state.get('latest_dates', {})
+    if not all(ticker in latest_dates for ticker in tickers):
+        return None
+    return {ticker: latest_dates[ticker] for ticker in tickers}
+
+def _save_fetcher_state(latest_dates: Dict[str, Optional[str]], data_version: Optional[int]):
+    """Write the sidecar atomically, stamped with the data version it matches - failures only cost the next run a DB query"""
+    if data_version is None:
+        return
+
+    tmp_file = FETCHER_STATE_FILE.with_suffix('.json.tmp')
+    try:
+        tmp_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'w') as f:
+            json.dump({'data_version': data_version, 'latest_dates': latest_dates}, f, separators=(',', ':'))
+        os.replace(tmp_file, FETCHER_STATE_FILE)
+    except OSError as e:
+        logger.debug(f"Could not save fetcher state: {e}")
+
+def _clear_fetcher_state():
+    """Invalidate the sidecar"""
+    try:
+        os.remove(FETCHER_STATE_FILE)
+    except FileNotFoundError:
+        pass
+
+def _copy_plan(plan: Dict[str, any]) -> Dict[str, any]:
+    """Copy of an update plan whose lists/dicts can be changed without touching the cached one"""
+    return {key: value.copy() if isinstance(value, (list, dict)) else value for key, value in plan.items()}
+
+def _numeric_array(values: np.ndarray) -> np.ndarray:
+    """OHLCV column as a numeric array - unparseable values and +/-inf become NaN"""
+    if not is_numeric_dtype(values.dtype):
+        values = pd.to_numeric(values, errors='coerce') #errors='coerce': Convert invalid values to NaN instead of erroring
+        values = np.asarray(values, dtype=np.float64)
+
+    if values.dtype.kind == 'f':
+        inf_mask = np.isinf(values)
+        if inf_mask.any():  # Rare - only copy when there is something to replace
+            values = np.where(inf_mask, np.nan, values)
+
+    return values
+
 class DataFetcher:
     """Optimized data fetcher for stocks"""
 
     def __init__(self):
         self.companies_file = config.COMPANIES_CSV
         self.start_date = config.START_DATE
-        self.end_date = config.END_DATE
         self.max_workers = config.MAX_WORKERS
+        self._ticker_cache: Dict[str, str] = {}  # 'RELIANCE.NS' -> 'RELIANCE'
+        self._plan_cache = {'key': None, 'plan': None}  # last update plan, valid while its key matches
+        self._symbols_cache = {'mtime_ns': None, 'symbols': None}  # parsed CSV, valid while the file is unchanged
 
-        # Configure environment for optimal performance
-        optimizer.configure_environment()
+    @property
+    def end_date(self) -> str:
+        """End date read from config on each access so long-running processes don't go stale"""
+        return config.end_date
 
     def get_stock_symbols(self) -> List[str]:
-        """Load stock symbols from CSV"""
+        """Load stock symbols from CSV (reparsed only when the file's modification time changes)"""
 
         try:
-            if not self.companies_file.exists():
+            try:
+                mtime_ns = os.stat(self.companies_file).st_mtime_ns
+            except FileNotFoundError:
                 logger.error(f"Companies file not found: {self.companies_file}")
                 return []
 
-            df = pd.read_csv(self.companies_file)
+            if self._symbols_cache['mtime_ns'] == mtime_ns:
+                return list(self._symbols_cache['symbols'])
+
+            # Only parse the Symbol column (callable usecols doesn't raise when it's missing)
+            df = pd.read_csv(self.companies_file, usecols=lambda col: col == 'Symbol', dtype={'Symbol': 'string'})
 
             if 'Symbol' not in df.columns:
                 logger.error("CSV must contain 'Symbol' column")
                 return []
 
-            df = df.dropna(subset=['Symbol'])  # Remove rows where Symbol is NaN
-            df = df[df['Symbol'].str.strip() != '']  # Remove rows where Symbol is empty string
+            # One mask drops NaN and empty symbols, then one vectorized concat adds the suffix
+            symbol_col = df['Symbol'].str.strip()
+            symbol_col = symbol_col[symbol_col.notna() & (symbol_col != '')]
 
-            symbols = [f"{symbol}.NS" for symbol in df['Symbol'].tolist()]
+            symbols = (symbol_col + '.NS').tolist()
             logger.info(f"Successfully loaded {len(symbols)} symbols from CSV")
-            return symbols
+
+            self._symbols_cache['mtime_ns'] = mtime_ns
+            self._symbols_cache['symbols'] = symbols
+            return list(symbols)
 
         except Exception as e:
             logger.error(f"Failed to load symbols from CSV: {e}")
             return []
 
-    def fetch_single_stock(self, symbol: str,
-                          start_date: Optional[str] = None,
-                          end_date: Optional[str] = None) -> Optional[pd.DataFrame]:
-        """Fetch data for a single stock symbol with timezone handling"""
+    def _bare_ticker(self, symbol: str) -> str:
+        """Database ticker for a Yahoo symbol (suffix stripped), cached per symbol"""
+        ticker = self._ticker_cache.get(symbol)
+        if ticker is None:
+            ticker = symbol[:-3] if symbol.endswith('.NS') else symbol
+            self._ticker_cache[symbol] = ticker
+        return ticker
 
-        start = start_date or self.start_date
-        end = end_date or self.end_date
-
-        # Don't fetch today's data - it's incomplete until evening
+    def _clamp_end_date(self, end: str) -> str:
+        """Don't fetch today's data - it's incomplete until evening"""
         today = datetime.now().date()
         end_dt = datetime.strptime(end, '%Y-%m-%d').date()
 
         if end_dt >= today:
             end = (today - timedelta(days=1)).strftime('%Y-%m-%d')
-            # Skip if start date is after end date (no new data needed)
+        return end
+
+    def _format_history(self, data: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """Convert a yfinance history frame (Date index, OHLCV columns) to the database schema"""
+
+        # TIMEZONE FIX: yfinance returns a timezone-aware Date index - strip it on the index itself,
+        # no reset_index/to_datetime round-trip through a column
+        dates = data.index
+        if dates.tz is not None:
+            dates = dates.tz_localize(None) #.tz_localize(None): remove timezone, Result: "Naive" datetime (no timezone info)
+
+        # Build the database-schema frame in one constructor straight from the column arrays,
+        # instead of assigning ticker, renaming, projecting and copying as separate steps
+        # Numeric columns are sanitized as plain numpy arrays before the frame exists - yfinance
+        # already returns float64/int64, so normally this is only an inf check
+        # ticker is one repeated value - store it as a single-category column (one code byte per row)
+        # rather than an object column holding a string reference per row
+        ticker = pd.Categorical.from_codes(np.zeros(len(dates), dtype=np.int8), categories=[self._bare_ticker(symbol)])
+
+        data = pd.DataFrame({
+            'ticker': ticker,
+            'date': dates.to_numpy(),
+            'open': _numeric_array(data['Open'].to_numpy()),
+            'high': _numeric_array(data['High'].to_numpy()),
+            'low': _numeric_array(data['Low'].to_numpy()),
+            'close': _numeric_array(data['Close'].to_numpy()),
+            'volume': _numeric_array(data['Volume'].to_numpy())
+        })
+
+        return data
+
+    def _fetch_history(self, symbol: str, start: str, end: str) -> pd.DataFrame:
+        """Ticker history with the settled part of the window served from the on-disk cache"""
+        ticker = yf.Ticker(symbol)
+        cutoff = _yf_cache.immutable_cutoff()
+
+        if start >= cutoff:
+            # Entirely recent - nothing cacheable
+            return ticker.history(start=start, end=end, auto_adjust=True, actions=False) #auto_adjust=True: Automatically adjust for stock splits/dividends, actions=False: we only keep OHLCV
+
+        cached_end = min(end, cutoff)
+        data = _yf_cache.fetch(
+            symbol, start, cached_end,
+            lambda fetch_start, fetch_end: ticker.history(start=fetch_start, end=fetch_end, auto_adjust=True, actions=False)
+        )
+
+        if end > cutoff:
+            # Recent tail can still change, always fetch it live
+            tail = _yf_cache.naive_dates(ticker.history(start=cutoff, end=end, auto_adjust=True, actions=False))
+            if not tail.empty:
+                data = pd.concat([data, tail]) if not data.empty else tail
+
+        return data
 
+    def fetch_single_stock(self, symbol: str,
+                          start_date: Optional[str] = None,
+                          end_date: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Fetch data for a single stock symbol with timezone handling"""
+
+        start = start_date or self.start_date
+        end = self._clamp_end_date(end_date or self.end_date)
+
+        # Skip if start date is after end date (no new data needed)
         if start and end and start > end:
             logger.debug(f"No new data needed for {symbol} (start: {start}, end: {end})")
             return None
 
-
-
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(start=start, end=end, auto_adjust=True) #auto_adjust=True: Automatically adjust for stock splits/dividends
+            data = self._fetch_history(symbol, start, end)
 
             if data.empty:
                 logger.warning(f"No data available for {symbol}")
                 return None
 
-            # Reset index to make Date a column
-            data = data.reset_index() #Default behavior: yfinance returns data with Date as index,After reset_index: Date becomes a normal column named 'Date',Why needed: Easier to work with Date as a column
-
-            # TIMEZONE FIX: Handle timezone-aware dates from yfinance
-            if 'Date' in data.columns:
-                # Convert to pandas datetime and remove timezone
-                data['Date'] = pd.to_datetime(data['Date'])
-                if hasattr(data['Date'].dtype, 'tz') and data['Date'].dtype.tz is not None:
-                    data['Date'] = data['Date'].dt.tz_localize(None) #.dt.tz_localize(None): Pandas method to remove timezone, Result: "Naive" datetime (no timezone info)
-                elif data['Date'].dt.tz is not None:
-                    data['Date'] = data['Date'].dt.tz_localize(None)
-
-            # Add ticker column
-            data['ticker'] = symbol.replace('.NS', '')
-
-            # Rename columns to match database schema
-            data = data.rename(columns={
-                'Date': 'date',
-                'Open': 'open',
-                'High': 'high',
-                'Low': 'low',
-                'Close': 'close',
-                'Volume': 'volume'
-            })
-
-            # Select only required columns and ensure proper data types
-            required_columns = ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume']
-            data = data[required_columns].copy()
-
-            # Ensure numeric columns are properly typed
-            numeric_cols = ['open', 'high', 'low', 'close', 'volume']
-            for col in numeric_cols:
-                data[col] = pd.to_numeric(data[col], errors='coerce') #errors='coerce': Convert invalid values to NaN instead of erroring
+            data = self._format_history(data, symbol)
 
             logger.debug(f"Successfully fetched {len(data)} records for {symbol}")
             return data
@@ -131,6 +268,114 @@ class DataFetcher:
             logger.error(f"Failed to fetch data for {symbol}: {e}")
             return None
 
+    def _download_batch(self, symbols: List[str], start: str, end: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        One yf.download call for several symbols
+
+        Returns:
+            {symbol: history} for the symbols that came back with rows, None if the download failed
+        """
+        try:
+            with _download_lock:
+                data = yf.download(
+                    symbols,
+                    start=start,
+                    end=end,
+                    group_by='ticker',
+                    threads=True,
+                    auto_adjust=True,
+                    actions=False,
+                    progress=False
+                )
+        except Exception as e:
+            logger.warning(f"Batch download failed for {len(symbols)} symbols, fetching individually: {e}")
+            return None
+
+        histories = {}
+        if isinstance(data.columns, pd.MultiIndex):
+            for symbol in set(data.columns.get_level_values(0)).intersection(symbols):
+                histories[symbol] = data[symbol].dropna(how='all') # Symbols are aligned on a shared index, drop dates this one didn't trade
+        elif len(symbols) == 1 and not data.empty:
+            histories[symbols[0]] = data.dropna(how='all')
+
+        return {symbol: history for symbol, history in histories.items() if not history.empty}
+
+    def fetch_stock_batch(self, symbols: List[str],
+                          start_date: Optional[str] = None,
+                          end_date: Optional[str] = None) -> Dict[str, Optional[pd.DataFrame]]:
+        """Fetch several symbols sharing one date range with a single yf.download call"""
+
+        start = start_date or self.start_date
+        end = self._clamp_end_date(end_date or self.end_date)
+
+        if start and end and start > end:
+            logger.debug(f"No new data needed for {len(symbols)} symbols (start: {start}, end: {end})")
+            return {symbol: None for symbol in symbols}
+
+        # Serve settled windows from the on-disk cache, only download the uncovered part of the rest
+        # Symbols cached on the same day share their missing range, so each range is one download
+        histories = {}
+        to_download: Dict[Tuple[str, str], List[str]] = {}
+        for symbol in symbols:
+            history = _yf_cache.load(symbol, start, end)
+            if history is not None:
+                histories[symbol] = history
+            else:
+                fetch_range = _yf_cache.missing_range(symbol, start, end) or (start, end)
+                to_download.setdefault(fetch_range, []).append(symbol)
+
+        for fetch_range, group in to_download.items():
+            downloaded = self._download_batch(group, *fetch_range)
+            if downloaded is None:
+                continue  # Download failed - every symbol of the group is fetched individually
+
+            for symbol in group:
+                history = _yf_cache.combine(symbol, start, end, fetch_range, downloaded.get(symbol, pd.DataFrame()))
+                if history is not None:
+                    histories[symbol] = history
+
+        results = {}
+        for symbol in symbols:
+            history = histories.get(symbol)
+
+            if history is None or history.empty:
+                # Missing from the batch response - retry on its own
+                results[symbol] = self.fetch_single_stock(symbol, start, end)
+                continue
+
+            try:
+                results[symbol] = self._format_history(history, symbol)
+            except Exception as e:
+                logger.error(f"Failed to process data for {symbol}: {e}")
+                results[symbol] = None
+
+        return results
+
+    def _db_writer(self, write_q: queue.Queue, insert_stats: Dict[str, int]):
+        """Insert queued batches until the None sentinel arrives - runs on its own thread"""
+        # Import database manager here to avoid circular import
+        from .database_manager import db_manager
+
+        while True:
+            item = write_q.get()
+            if item is None:
+                break
+
+            first_symbol, batch_df = item
+            try:
+                inserted = db_manager.insert_dataframe_chunked(batch_df)
+            except Exception as e:
+                # Keep draining the queue - a dead writer would block the fetch loop on put()
+                logger.error(f"Database writer error: {e}")
+                inserted = False
+
+            if inserted:
+                insert_stats['total_records'] += len(batch_df)
+                insert_stats['inserted_batches'] += 1
+            else:
+                insert_stats['failed_inserts'] += 1
+                logger.error(f"Database insertion failed for batch starting at {first_symbol}")
+
     def fetch_all_stocks_concurrent(self,
                               symbols: Optional[List[str]] = None,
                               update_callback: Optional[callable] = None,
@@ -147,6 +392,9 @@ class DataFetcher:
         # Determine fetch strategy
         if full_refresh:
             logger.info(f"Starting FULL REFRESH for {len(symbols)} symbols")
+            _clear_fetcher_state()
+            # Cached adjusted prices predate any split or dividend since they were stored - re-download them
+            _yf_cache.clear()
 
             # Use start_date for all symbols
             symbol_date_ranges = {symbol: (self.start_date, self.end_date) for symbol in symbols}
@@ -165,7 +413,8 @@ class DataFetcher:
 
 
             if not symbols_to_process:
-                # No symbols need updates
+                # No symbols need updates - remember that so the next run can skip the DB query
+                _save_fetcher_state(plan['latest_dates'], plan.get('data_version'))
                 return True, {
                     "success": True,
                     "mode": "incremental",
@@ -183,108 +432,139 @@ class DataFetcher:
         start_time = time.time()
         successful_fetches = 0
         failed_fetches = 0
-        all_data = []
+        fetched_latest = {}  # ticker -> newest fetched date, for the fetcher state sidecar
         skipped_fetches = len(symbols) - len(symbols_to_process) if not full_refresh else 0
         symbols_to_fetch_count = len(symbols_to_process)
-        # Set delay based on workload
+        # Set delay based on workload (applied after each completed batch)
         if symbols_to_fetch_count > 1000:
             per_stock_delay = 0.5  # Large batch - be careful
         else:
             per_stock_delay = 0.1  # Small batch - minimal delay
-        # Use ThreadPoolExecutor with optimal worker count, submit all 500 stocks to the threadpool so they can process in parallel
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-        # Submit all tasks with their specific date ranges
-
-            future_to_symbol = {}
-            for symbol in symbols_to_process:
-                start_date, end_date = symbol_date_ranges[symbol]
-                future = executor.submit(self.fetch_single_stock, symbol, start_date, end_date)
-                future_to_symbol[future] = symbol
-
-            # Process completed tasks
-            for future in as_completed(future_to_symbol): #Iterate through tasks as they complete,  Tasks can complete in any order
-                symbol = future_to_symbol[future] # Look up which symbol this completed task represents, Example: If future completed, this might return "RELIANCE.NS"
-
-                try:
-                    data = future.result()
-
-                    if data is not None and not data.empty:
-                        all_data.append(data)
-                        successful_fetches += 1
-                        time.sleep(per_stock_delay)
-                        logger.info(f"Successfully fetched {symbol}: {len(data)} records")
-                    else:
-                        if not full_refresh:
-                            # In incremental mode, no data often means up-to-date
-                            logger.debug(f"No new data for {symbol} (likely up-to-date)")
-                        else:
-                            failed_fetches += 1
-                            logger.warning(f"No data retrieved for {symbol}")
-
-                except Exception as e:
-                    failed_fetches += 1
-                    logger.error(f"Error processing {symbol}: {e}")
-
-                # Call update callback if provided
-                if update_callback:
-                    progress = (successful_fetches + failed_fetches) / len(symbols_to_process)
-                    update_callback(progress, symbol, successful_fetches, failed_fetches)
-
-                if successful_fetches % 500 == 0 and successful_fetches > 0:
-                    logger.info("Processed 500 stocks, pausing 30 seconds to avoid rate limits...")
-                    time.sleep(60)
-
-        # Combine all data with additional timezone safety
-        if all_data: #Check if we have any successful data to process
-            try:
-                combined_data = pd.concat(all_data, ignore_index=True) #Combine all individual stock DataFrames into one large DataFrame,ignore_index=True: Create new sequential index instead of preserving original indexes
+        # Group symbols sharing a date range so each group is downloaded in batches
+        range_buckets = {}
+        for symbol in symbols_to_process:
+            range_buckets.setdefault(symbol_date_ranges[symbol], []).append(symbol)
+
+        batch_size = config.DOWNLOAD_BATCH_SIZE
+        batches = [
+            (bucket[i:i + batch_size], start_date, end_date)
+            for (start_date, end_date), bucket in range_buckets.items()
+            for i in range(0, len(bucket), batch_size)
+        ]
+        logger.info(f"Fetching {symbols_to_fetch_count} symbols in {len(batches)} batches")
+
+        # Single DB writer thread fed through a bounded queue (a slow disk applies backpressure)
+        write_q = queue.Queue(maxsize=32)
+        insert_stats = {'total_records': 0, 'failed_inserts': 0, 'inserted_batches': 0}
+        writer = threading.Thread(target=self._db_writer, args=(write_q, insert_stats),
+                                  name="db-writer", daemon=True)
+        writer.start()
 
-                # SAFETY CHECK: Remove timezone if present (pandas concat can sometimes reintroduce timezones)
-                # We check this again when we are inserting to dataframe therefore this is redundant
-                #if 'date' in combined_data.columns and combined_data['date'].dt.tz is not None:
-                #   combined_data['date'] = combined_data['date'].dt.tz_localize(None)
-                #    logger.debug("Removed timezone from combined data (safety check)")
-
-                # Import database manager here to avoid circular import
-                from .database_manager import db_manager
-
-                # Store in database
-                logger.info(f"Inserting {len(combined_data)} records into database...")
-                success = db_manager.insert_dataframe_chunked(combined_data)
-
-                end_time = time.time()
-                duration = end_time - start_time
-
-                result = {
-                    "success": success,
-                    "mode": "full_refresh" if full_refresh else "incremental",
-                    "total_symbols": len(symbols),
-                    "successful_fetches": successful_fetches,
-                    "failed_fetches": failed_fetches,
-                    "skipped_fetches": skipped_fetches,
-                    "total_records": len(combined_data),
-                    "duration_seconds": round(duration, 2),
-                    "records_per_second": round(len(combined_data) / duration, 2)
+        try:
+            # Use ThreadPoolExecutor with optimal worker count to dispatch the batches,
+            # never more threads than batches - extra workers would only sit idle
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            # Submit all batches with their shared date ranges
+
+                future_to_batch = {
+                    executor.submit(self.fetch_stock_batch, batch_symbols, start_date, end_date): batch_symbols
+                    for batch_symbols, start_date, end_date in batches
                 }
 
-                if success:
-                    logger.info(f"Fetch operation completed successfully: {successful_fetches}/{len(symbols)} stocks processed")
-                    logger.info(f"Performance: {duration:.2f}s duration, {result['records_per_second']:.2f} records/s")
-                else:
-                    logger.error("Database insertion failed after successful data fetch")
-
-                return success, result
+                # Process completed batches
+                for future in as_completed(future_to_batch): #Iterate through batches as they complete, batches can complete in any order
+                    batch_symbols = future_to_batch[future]
 
-            except Exception as e:
-                logger.error(f"Error combining or inserting data: {e}")
-                return False, {"error": f"Data processing failed: {e}"}
-        else:
+                    try:
+                        batch_data = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing batch starting at {batch_symbols[0]}: {e}")
+                        batch_data = {}
+
+                    batch_frames = []
+                    for symbol in batch_symbols:
+                        data = batch_data.get(symbol)
+
+                        if data is not None and not data.empty:
+                            batch_frames.append(data)
+                            fetched_latest[self._bare_ticker(symbol)] = data['date'].max().strftime('%Y-%m-%d')
+                            successful_fetches += 1
+                            logger.info(f"Successfully fetched {symbol}: {len(data)} records")
+                        else:
+                            if not full_refresh:
+                                # In incremental mode, no data often means up-to-date
+                                logger.debug(f"No new data for {symbol} (likely up-to-date)")
+                            else:
+                                failed_fetches += 1
+                                logger.warning(f"No data retrieved for {symbol}")
+
+                        # Call update callback if provided
+                        if update_callback:
+                            progress = (successful_fetches + failed_fetches) / len(symbols_to_process)
+                            update_callback(progress, symbol, successful_fetches, failed_fetches)
+
+                        if successful_fetches % 500 == 0 and successful_fetches > 0:
+                            logger.info("Processed 500 stocks, pausing 30 seconds to avoid rate limits...")
+                            time.sleep(60)
+
+                    # Hand each batch to the writer thread as soon as it completes instead of holding
+                    # every symbol in memory - inserts overlap with pending downloads and result handling
+                    if batch_frames:
+                        batch_df = pd.concat(batch_frames, ignore_index=True) if len(batch_frames) > 1 else batch_frames[0]
+                        write_q.put((batch_symbols[0], batch_df))
+
+                    time.sleep(per_stock_delay)
+        finally:
+            # Sentinel - writer drains the queue and exits
+            write_q.put(None)
+            writer.join()
+
+        total_records = insert_stats['total_records']
+        failed_inserts = insert_stats['failed_inserts']
+
+        if successful_fetches == 0: #Check if we have any successful data
             logger.error(f"No data fetched successfully from {len(symbols)} symbols")
             return False, {
                 "error": "No data fetched successfully",
                 "failed_fetches": failed_fetches
             }
 
+        end_time = time.time()
+        duration = end_time - start_time
+        success = failed_inserts == 0
+
+        result = {
+            "success": success,
+            "mode": "full_refresh" if full_refresh else "incremental",
+            "total_symbols": len(symbols),
+            "successful_fetches": successful_fetches,
+            "failed_fetches": failed_fetches,
+            "skipped_fetches": skipped_fetches,
+            "total_records": total_records,
+            "duration_seconds": round(duration, 2),
+            "records_per_second": round(total_records / duration, 2)
+        }
+
+        if success and not full_refresh and plan.get('data_version') is not None:
+            from .database_manager import db_manager
+
+            # Every insert bumped the data version once - any other difference means another
+            # process wrote meanwhile, and the merged dates below may not match the database
+            data_version = db_manager.get_data_version()
+            if data_version == plan['data_version'] + insert_stats['inserted_batches']:
+                # Database now holds the plan's dates plus everything just fetched
+                state = dict(plan['latest_dates'])
+                state.update(fetched_latest)
+                _save_fetcher_state(state, data_version)
+
+        if success:
+            logger.info(f"Fetch operation completed successfully: {successful_fetches}/{len(symbols)} stocks processed")
+            logger.info(f"Performance: {duration:.2f}s duration, {result['records_per_second']:.2f} records/s")
+        else:
+            logger.error(f"Database insertion failed for {failed_inserts} batches after successful data fetch")
+
+        return success, result
+
     def get_update_plan(self, symbols: Optional[List[str]] = None) -> Dict[str, any]:
         """Analyze what data needs to be fetched for each symbol"""
         if symbols is None:
@@ -296,67 +576,78 @@ class DataFetcher:
                 'symbols_needing_update': [],
                 'symbols_up_to_date': [],
                 'update_ranges': {},
-                'total_symbols': 0
+                'total_symbols': 0,
+                'latest_dates': {}
             }
 
+        # Same symbols, same day and an untouched database always give the same plan - return it
+        # without reading the sidecar or querying the database (status checks call this repeatedly)
+        plan_key = (tuple(symbols), self.start_date, self.end_date, datetime.now().date(), _db_mtime_ns())
+        if plan_key[-1] is not None and self._plan_cache['key'] == plan_key:
+            return _copy_plan(self._plan_cache['plan'])
+
         try:
             from .database_manager import db_manager
 
             # Convert symbols to ticker format for database query
-            tickers = [symbol.replace('.NS', '') for symbol in symbols]
-
-            # Get latest dates from database
-            latest_dates = db_manager.get_latest_dates(tickers)
+            tickers = [self._bare_ticker(symbol) for symbol in symbols]
+
+            # Get latest dates - from the sidecar when nothing wrote to the database since, else from the database.
+            # Read the version first, so a write landing in between makes the saved state look stale, never fresh
+            data_version = db_manager.get_data_version()
+            latest_dates = _load_fetcher_state(tickers, data_version)
+            if latest_dates is None:
+                latest_dates = db_manager.get_latest_dates(tickers)
+            else:
+                logger.debug("Using cached fetcher state for latest dates")
+
+            # Latest stored date per symbol as datetime64[D] - NaT where there is no data yet.
+            # reindex aligns the dict to the symbol order and to_datetime parses it in one C pass,
+            # unparseable dates become NaT too (and fall back to a full fetch)
+            stored = pd.Series(latest_dates, dtype=object).reindex(tickers)
+            parsed = pd.to_datetime(stored, format='%Y-%m-%d', errors='coerce')
+            latest = parsed.to_numpy().astype('datetime64[D]')
+
+            need_full = np.isnat(latest)
+            invalid = int((stored.notna() & parsed.isna()).sum())
+            if invalid:
+                logger.warning(f"Date parsing failed for {invalid} symbols, scheduling full fetch")
+
+            # Calculate next day after latest data, and the gap to end_date in one vectorized pass
+            today = np.datetime64(datetime.now().date(), 'D')
+            end_day = np.datetime64(self.end_date, 'D')
+            next_days = latest + np.timedelta64(1, 'D')
+            days_diff = (end_day - latest).astype('int64')
+
+            # Check if there's a meaningful gap (more than 3 days)
+            # This prevents fetching non-existent weekend data
+            need_update = ~need_full & (next_days <= today) & (days_diff > 3)
+            up_to_date = ~need_full & ~need_update
+
+            symbols_arr = np.array(symbols, dtype=object)
+            full_symbols = symbols_arr[need_full].tolist()
+            update_symbols = symbols_arr[need_update].tolist()
+            update_starts = next_days[need_update].astype(str).tolist() # ISO strings only for symbols being updated
+
+            update_ranges = {symbol: (self.start_date, self.end_date) for symbol in full_symbols}
+            update_ranges.update((symbol, (start, self.end_date)) for symbol, start in zip(update_symbols, update_starts))
 
             plan = {
-                'symbols_needing_full_fetch': [],
-                'symbols_needing_update': [],
-                'symbols_up_to_date': [],
-                'update_ranges': {},
-                'total_symbols': len(symbols)
+                'symbols_needing_full_fetch': full_symbols,
+                'symbols_needing_update': update_symbols,
+                'symbols_up_to_date': symbols_arr[up_to_date].tolist(),
+                'update_ranges': update_ranges,
+                'total_symbols': len(symbols),
+                'latest_dates': latest_dates,
+                'data_version': data_version
             }
 
-            today = datetime.now().strftime('%Y-%m-%d')
-
-            for symbol in symbols:
-                ticker = symbol.replace('.NS', '')
-                latest_date = latest_dates.get(ticker)
-
-                if latest_date is None:
-                    # No data exists, need full fetch
-                    plan['symbols_needing_full_fetch'].append(symbol)
-                    plan['update_ranges'][symbol] = (self.start_date, self.end_date)
-                else:
-                    # Calculate next day after latest data
-                    try:
-                        latest_dt = datetime.strptime(latest_date, '%Y-%m-%d')
-                        next_day = latest_dt + timedelta(days=1)
-                        start_date = next_day.strftime('%Y-%m-%d')
-
-                        if start_date <= today:
-                            # Check if there's a meaningful gap (more than 3 days)
-                            # This prevents fetching non-existent weekend data
-                            days_diff = (datetime.strptime(self.end_date, '%Y-%m-%d') - latest_dt).days
-
-                            if days_diff > 3:
-                                plan['symbols_needing_update'].append(symbol)
-                                plan['update_ranges'][symbol] = (start_date, self.end_date)
-
-                            else:
-                                # Too close to end_date, likely weekend - mark as up to date
-                                plan['symbols_up_to_date'].append(symbol)
-
-                        else:
-                            plan['symbols_up_to_date'].append(symbol)
-                    except Exception as e:
-                        logger.warning(f"Date parsing failed for {symbol}: {e}")
-                        plan['symbols_needing_full_fetch'].append(symbol)
-                        plan['update_ranges'][symbol] = (self.start_date, self.end_date)
-
             logger.info(f"Update plan: {len(plan['symbols_needing_full_fetch'])} full, "
                     f"{len(plan['symbols_needing_update'])} incremental, "
                     f"{len(plan['symbols_up_to_date'])} up-to-date")
 
+            self._plan_cache['key'] = plan_key
+            self._plan_cache['plan'] = _copy_plan(plan)
             return plan
 
         except Exception as e:
@@ -366,7 +657,8 @@ class DataFetcher:
                 'symbols_needing_update': [],
                 'symbols_up_to_date': [],
                 'update_ranges': {symbol: (self.start_date, self.end_date) for symbol in symbols},
-                'total_symbols': len(symbols)
+                'total_symbols': len(symbols),
+                'latest_dates': {}
             }
 
     def update_stock_data(self, symbols: Optional[List[str]] = None,
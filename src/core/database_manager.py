@@ -3,37 +3,189 @@ Database management with Apple Silicon optimizations - TIMEZONE FIX
 Sqlite does not handle timezones well, so we have to remove the timezones and only use date
 """
 
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text
-from typing import Optional, Dict, List, Any
+from sqlalchemy import bindparam, create_engine, event, text
+from sqlalchemy.pool import StaticPool
+from typing import Optional, Dict, List, Any, Iterator
 
 from ..config.settings import config
 from .apple_silicon_optimizer import optimizer
 from ..utils.logger import get_logger
 
+# connectorx is optional - reads straight into columnar arrays instead of DBAPI row tuples,
+# full-table reads go through pd.read_sql when it isn't installed
+try:
+    import connectorx as cx
+    CONNECTORX_AVAILABLE = True
+except ImportError:
+    CONNECTORX_AVAILABLE = False
+
 logger = get_logger(__name__)
 
+INSERT_STOCK_DATA_SQL = """
+    INSERT OR REPLACE INTO stock_data
+    (ticker, date, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+CREATE_DATE_INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_date ON stock_data(date)"
+
+# Inserts at least this large that also outnumber the rows already stored drop idx_date and
+# rebuild it afterwards - one sorted build beats maintaining the B-tree row by row
+BULK_LOAD_MIN_ROWS = 100_000
+
+# Read statements built once at import - text() constructs are reused on every call
+ALL_STOCK_DATA_SQL = "SELECT * FROM stock_data ORDER BY ticker, date"  # Plain string for connectorx
+ALL_STOCK_DATA_QUERY = text(ALL_STOCK_DATA_SQL)
+TICKER_STOCK_DATA_QUERY = text("SELECT * FROM stock_data WHERE ticker = :ticker ORDER BY ticker, date")
+
+DATABASE_STATS_QUERY = text("""
+    SELECT
+        COUNT(*) as total_records,
+        COUNT(DISTINCT ticker) as unique_tickers,
+        date(MIN(date) * 86400, 'unixepoch') as earliest_date,
+        date(MAX(date) * 86400, 'unixepoch') as latest_date
+    FROM stock_data
+""")
+
+CREATE_WANTED_TICKERS_SQL = text("CREATE TEMP TABLE IF NOT EXISTS wanted_tickers (ticker TEXT PRIMARY KEY)")
+CLEAR_WANTED_TICKERS_SQL = text("DELETE FROM wanted_tickers")
+INSERT_WANTED_TICKER_SQL = text("INSERT OR IGNORE INTO wanted_tickers (ticker) VALUES (:ticker)")
+
+# Correlated MAX per ticker - one primary key seek each instead of a table scan
+WANTED_LATEST_DATES_QUERY = text("""
+    SELECT w.ticker,
+           (SELECT date(MAX(s.date) * 86400, 'unixepoch')
+            FROM stock_data s WHERE s.ticker = w.ticker) as latest_date
+    FROM wanted_tickers w
+""")
+ALL_LATEST_DATES_QUERY = text("""
+    SELECT ticker, date(MAX(date) * 86400, 'unixepoch') as latest_date
+    FROM stock_data
+    GROUP BY ticker
+""")
+
+_STOCK_DATA_STATS_SELECT = """
+    SELECT
+        ticker,
+        MIN(date) as first_date,
+        MAX(date) as last_date,
+        COUNT(*) as total_records
+    FROM stock_data
+"""
+ALL_STOCK_DATA_STATS_QUERY = text(_STOCK_DATA_STATS_SELECT + " GROUP BY ticker ORDER BY ticker")
+TICKER_STOCK_DATA_STATS_QUERY = text(_STOCK_DATA_STATS_SELECT + " WHERE ticker = :ticker GROUP BY ticker ORDER BY ticker")
+
+# Expanding IN - one statement for any number of selected tickers
+COUNT_TICKER_RECORDS_QUERY = text(
+    "SELECT ticker, COUNT(*) FROM stock_data WHERE ticker IN :tickers GROUP BY ticker"
+).bindparams(bindparam('tickers', expanding=True))
+DELETE_TICKERS_SQL = text(
+    "DELETE FROM stock_data WHERE ticker IN :tickers"
+).bindparams(bindparam('tickers', expanding=True))
+
+# Write counter stored in the database itself, bumped in the same transaction as every write made
+# through this manager - unlike file mtimes it survives restarts and WAL checkpoints
+CREATE_DB_META_SQL = "CREATE TABLE IF NOT EXISTS db_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+INIT_DATA_VERSION_SQL = "INSERT OR IGNORE INTO db_meta (key, value) VALUES ('data_version', 0)"
+BUMP_DATA_VERSION_SQL = "UPDATE db_meta SET value = value + 1 WHERE key = 'data_version'"
+DATA_VERSION_QUERY = text("SELECT value FROM db_meta WHERE key = 'data_version'")
+
+# Schema version stored in PRAGMA user_version:
+# 1 = stock_data.date holds INTEGER days since 1970-01-01 (0 = TEXT dates)
+# 2 = idx_ticker/idx_ticker_date dropped, the primary key index already covers them
+SCHEMA_VERSION = 2
+
+# Seconds a get_latest_dates result is reused (writes through this manager clear it immediately)
+LATEST_DATES_TTL = 60
+
+# Seconds database/per-stock stats are reused - Refresh clicks and tab switches skip the aggregate scan
+STATS_TTL = 60
+
 class DatabaseManager:
     """Optimized database manager for stock data"""
 
     def __init__(self):
         self.db_path = config.DB_PATH
-        self.engine = None
+        self._engine = None  # Single writer connection, use under write_lock
+        self._read_engine = None  # Pool of read-only connections for queries
+        self.write_lock = threading.Lock()
+        self._init_lock = threading.Lock()
         self.is_initialized = False
         self.optimal_settings = optimizer.get_optimal_settings()
+        self._latest_dates_cache = {}  # sorted ticker tuple (or None for all) -> (fetched_at, latest_dates)
+        self._stats_cache = {}  # ('database',) or ('stocks', ticker) -> (fetched_at, stats)
+
+    @property
+    def engine(self):
+        """Writer engine, initializing the database on first access - use under write_lock"""
+        if not self.is_initialized:
+            self.initialize()
+        return self._engine
+
+    @property
+    def read_engine(self):
+        """Read-only engine, initializing the database on first access"""
+        if not self.is_initialized:
+            self.initialize()
+        return self._read_engine
+
+    @contextmanager
+    def conn(self) -> Iterator[Any]:
+        """Pooled read-only connection"""
+        with self.read_engine.connect() as conn:
+            yield conn
+
+    @contextmanager
+    def write_conn(self) -> Iterator[Any]:
+        """The writer connection, held under write_lock - call conn.commit() to keep changes"""
+        engine = self.engine  # Resolve before locking - first use initializes, which takes write_lock
+        with self.write_lock, engine.connect() as conn:
+            yield conn
 
     def initialize(self):
-        """Initialize database with optimizations"""
+        """Initialize database with optimizations (once - later calls return immediately)"""
+        with self._init_lock:
+            if not self.is_initialized:
+                self._initialize()
+
+    def _initialize(self):
+        """Create the engines, tables and schema migrations"""
         try:
-            self.engine = create_engine(
+            config.ensure_directories()  # SQLite can't create the database file in a missing DB_DIR
+
+            # One serialized writer connection (SQLite allows a single writer at a time anyway),
+            # shared across threads and guarded by write_lock
+            self._engine = create_engine(
                 config.db_url,
                 echo=False,
-                pool_pre_ping=True,
-                pool_recycle=3600
+                poolclass=StaticPool,
+                connect_args={'check_same_thread': False}
             )
 
-            self._apply_sqlite_optimizations()
+            # PRAGMAs are per connection - apply them to every connection the pool opens
+            event.listen(self._engine, "connect", self._apply_sqlite_optimizations)
+
             self._create_tables()
+            self._migrate_schema()
+            self._optimize()
+
+            # Readers open the file read-only, so under WAL they never take the write lock.
+            # Created after the tables exist - mode=ro can't create the file
+            self._read_engine = create_engine(
+                "sqlite://",
+                creator=self._connect_read_only,
+                echo=False,
+                pool_pre_ping=True,
+                pool_recycle=3600
+            )
+            event.listen(self._read_engine, "connect", self._apply_read_optimizations)
 
             self.is_initialized = True
             logger.info("Database initialized successfully")
@@ -42,30 +194,58 @@ class DatabaseManager:
             logger.error(f"Database initialization failed: {e}")
             raise
 
-    def _apply_sqlite_optimizations(self):
-        """Apply SQLite optimizations"""
-        optimization_queries = [
-            "PRAGMA journal_mode = WAL",
-            "PRAGMA synchronous = NORMAL",
-            f"PRAGMA cache_size = {self.optimal_settings['cache_size']}",
-            "PRAGMA optimize"
+    def _connect_read_only(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database file"""
+        return sqlite3.connect(f"file:{quote(str(self.db_path))}?mode=ro", uri=True, check_same_thread=False)
+
+    def _read_pragmas(self) -> List[str]:
+        """PRAGMAs for every connection"""
+        return [
+            f"cache_size = {self.optimal_settings['cache_size']}",
+            "temp_store = MEMORY",
+            "mmap_size = 268435456",  # 256MB memory-mapped reads
+            "busy_timeout = 5000"  # Wait up to 5s for a lock instead of failing with SQLITE_BUSY
         ]
 
+    def _apply_sqlite_optimizations(self, dbapi_conn, connection_record):
+        """Apply SQLite optimizations to a new writer connection (SQLAlchemy connect event)"""
+        self._run_pragmas(dbapi_conn, [
+            "journal_mode = WAL",
+            "synchronous = NORMAL",
+            "wal_autocheckpoint = 1000"
+        ] + self._read_pragmas())
+
+    def _apply_read_optimizations(self, dbapi_conn, connection_record):
+        """Apply SQLite optimizations to a new read-only connection (SQLAlchemy connect event)"""
+        self._run_pragmas(dbapi_conn, self._read_pragmas())
+
+    def _run_pragmas(self, dbapi_conn, optimization_pragmas: List[str]):
+        """Execute PRAGMAs on a raw connection"""
+        cursor = dbapi_conn.cursor()
         try:
-            with self.engine.connect() as conn:
-                for query in optimization_queries:
-                    conn.execute(text(query))
-                    conn.commit()
-                logger.info("SQLite optimizations applied")
+            for pragma in optimization_pragmas:
+                cursor.execute(f"PRAGMA {pragma}")
         except Exception as e:
             logger.warning(f"Could not apply all optimizations: {e}")
+        finally:
+            cursor.close()
+
+    def _optimize(self):
+        """Let SQLite refresh query planner statistics where needed"""
+        try:
+            with self._engine.connect() as conn:
+                conn.execute(text("PRAGMA optimize"))
+                conn.commit()
+                logger.info("SQLite optimizations applied")
+        except Exception as e:
+            logger.warning(f"Could not run PRAGMA optimize: {e}")
 
     def _create_tables(self):
         """Create database tables"""
         create_table_query = '''
         CREATE TABLE IF NOT EXISTS stock_data (
             ticker TEXT NOT NULL,
-            date DATE NOT NULL,
+            date INTEGER NOT NULL,  -- days since 1970-01-01
             open REAL,
             high REAL,
             low REAL,
@@ -77,16 +257,18 @@ class DatabaseManager:
         );
         '''
 
+        # PRIMARY KEY (ticker, date) already is a (ticker, date) index - it serves ticker lookups
+        # and the GROUP BY ticker MIN/MAX(date)/COUNT(*) aggregations as an index-only scan
         indexes = [
-            "CREATE INDEX IF NOT EXISTS idx_ticker_date ON stock_data(ticker, date);",
-            "CREATE INDEX IF NOT EXISTS idx_date ON stock_data(date);",
-            "CREATE INDEX IF NOT EXISTS idx_ticker ON stock_data(ticker);"
+            CREATE_DATE_INDEX_SQL
         ]
 
         try:
-            with self.engine.connect() as conn:
+            with self._engine.connect() as conn:
                 # Create table
                 conn.execute(text(create_table_query))
+                conn.execute(text(CREATE_DB_META_SQL))
+                conn.execute(text(INIT_DATA_VERSION_SQL))
 
                 # Create each index separately
                 for index_query in indexes:
@@ -98,70 +280,151 @@ class DatabaseManager:
             logger.error(f"Table creation failed: {e}")
             raise
 
-    def insert_dataframe_chunked(self, df: pd.DataFrame) -> bool:
+    def _migrate_schema(self):
+        """Bring databases created by older versions up to SCHEMA_VERSION (each step runs once)"""
+        try:
+            with self.write_lock, self._engine.connect() as conn:
+                version = conn.execute(text("PRAGMA user_version")).scalar()
+                if version >= SCHEMA_VERSION:
+                    return
+
+                if version < 1:
+                    # TEXT 'YYYY-MM-DD' dates -> INTEGER epoch days
+                    result = conn.execute(text("""
+                        UPDATE OR REPLACE stock_data
+                        SET date = CAST(julianday(date) - 2440587.5 AS INTEGER)
+                        WHERE typeof(date) = 'text'
+                    """))
+                    if result.rowcount:
+                        logger.info(f"Migrated {result.rowcount} rows to integer dates")
+
+                if version < 2:
+                    # Redundant with the primary key index - only cost space and insert time
+                    conn.execute(text("DROP INDEX IF EXISTS idx_ticker_date"))
+                    conn.execute(text("DROP INDEX IF EXISTS idx_ticker"))
+                    # Fresh statistics so the planner picks the primary key index
+                    conn.execute(text("ANALYZE stock_data"))
+
+                conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Schema migration failed: {e}")
+            raise
+
+    def invalidate_caches(self):
+        """Drop cached query results - call after writing to stock_data outside this manager"""
+        self._latest_dates_cache.clear()
+        self._stats_cache.clear()
+
+    def _cached_stats(self, key):
+        """Stats stored under key if younger than STATS_TTL, else None"""
+        cached = self._stats_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < STATS_TTL:
+            return cached[1]
+        return None
+
+    def insert_dataframe_chunked(self, df: pd.DataFrame, fast_ingest: bool = False) -> bool:
         """
         Insert DataFrame with proper timezone handling
 
         Args:
             df: DataFrame to insert
+            fast_ingest: Skip fsyncs (PRAGMA synchronous = OFF) for this insert - explicit opt-in
+                         for scratch loads only: an OS crash or power loss during or soon after
+                         the insert can corrupt the database file, even in WAL mode
 
         Returns:
             bool: True if successful, False otherwise
         """
-        if not self.is_initialized:
-            self.initialize()
-
         if df.empty:
             logger.warning("Attempted to insert empty DataFrame")
             return False
 
         try:
-            # TIMEZONE FIX: Convert timezone-aware dates to naive dates
-            df_copy = df.copy()
-
-            if 'date' in df_copy.columns:
-                # Convert to datetime and remove timezone info
-                df_copy['date'] = pd.to_datetime(df_copy['date'])
-                if df_copy['date'].dt.tz is not None:
-                    df_copy['date'] = df_copy['date'].dt.tz_localize(None)
-                # Convert to string format for database
-                df_copy['date'] = df_copy['date'].dt.strftime('%Y-%m-%d')
+            # TIMEZONE FIX: drop timezone info keeping the wall-clock date (tz_localize, not
+            # a UTC conversion, which would move non-US exchange dates to the previous day)
+            dates = pd.to_datetime(df['date'])
+            if dates.dt.tz is not None:
+                dates = dates.dt.tz_localize(None)
+
+            # Validate once up front - rows without a ticker or date would violate NOT NULL
+            valid = (df['ticker'].notna() & dates.notna()).to_numpy()
+            if not valid.all():
+                logger.warning(f"Skipping {int((~valid).sum())} rows without ticker or date")
+
+            # Pull each column once as a NumPy array - no df.copy(), and the dates become
+            # epoch days through a vectorized datetime64[D] cast instead of a per-row strftime
+            tickers = df['ticker'].to_numpy(dtype=object)[valid]
+            day_numbers = dates.to_numpy().astype('datetime64[D]')[valid].astype(np.int64)
+
+            # Nullable Float64 - NaN and None both become pd.NA, which to_numpy(na_value=None)
+            # turns into NULL in one vectorized pass per chunk (volume keeps INTEGER affinity)
+            values = [
+                df[col].astype('Float64').array[valid]
+                for col in ('open', 'high', 'low', 'close', 'volume')
+            ]
 
             chunk_size = 10000
-            total_rows = len(df_copy)
+            total_rows = len(tickers)
             inserted_count = 0
 
             logger.info(f"Inserting {total_rows} rows in chunks of {chunk_size}")
 
-            with self.engine.connect() as conn:
-                for i in range(0, total_rows, chunk_size):
-                    chunk = df_copy.iloc[i:i+chunk_size]
-
-                    for _, row in chunk.iterrows():
-                        try:
-                            insert_query = text("""
-                                INSERT OR REPLACE INTO stock_data
-                                (ticker, date, open, high, low, close, volume)
-                                VALUES (:ticker, :date, :open, :high, :low, :close, :volume)
-                            """)
-
-                            conn.execute(insert_query, {
-                                'ticker': str(row['ticker']),
-                                'date': str(row['date']),
-                                'open': float(row['open']) if pd.notna(row['open']) else None,
-                                'high': float(row['high']) if pd.notna(row['high']) else None,
-                                'low': float(row['low']) if pd.notna(row['low']) else None,
-                                'close': float(row['close']) if pd.notna(row['close']) else None,
-                                'volume': int(row['volume']) if pd.notna(row['volume']) else None
-                            })
-                            inserted_count += 1
-
-                        except Exception as e:
-                            logger.debug(f"Skipped row: {e}")
-
-                    conn.commit()
-                    if (i // chunk_size + 1) % 10 == 0:
-                        logger.info(f"Processed {i + len(chunk)} / {total_rows} rows")
+            # Raw sqlite3 connection: positional executemany without SQLAlchemy's per-row
+            # parameter processing, and one transaction (one commit/fsync) for the whole frame
+            engine = self.engine  # Resolve before locking - first use initializes, which takes write_lock
+            with self.write_lock:
+                raw_conn = engine.raw_connection()
+                try:
+                    cursor = raw_conn.cursor()
+                    if fast_ingest:
+                        # Only an application crash is safe here - an OS crash or power loss
+                        # before the OS flushes its cache can corrupt the file, WAL or not
+                        cursor.execute("PRAGMA synchronous = OFF")
+
+                    # Take the write lock up front - another writer (e.g. a second app instance)
+                    # then waits on busy_timeout before any work instead of failing mid-insert
+                    cursor.execute("BEGIN IMMEDIATE")
+
+                    # MAX(rowid) is an O(log n) upper bound on the stored row count
+                    rebuild_date_index = False
+                    if total_rows >= BULK_LOAD_MIN_ROWS:
+                        stored_rows = cursor.execute("SELECT MAX(rowid) FROM stock_data").fetchone()[0] or 0
+                        rebuild_date_index = total_rows >= stored_rows
+                    if rebuild_date_index:
+                        # Inside the transaction - readers keep seeing the old index until commit
+                        logger.info("Bulk load: dropping idx_date until the insert finishes")
+                        cursor.execute("DROP INDEX IF EXISTS idx_date")
+
+                    for i in range(0, total_rows, chunk_size):
+                        end = i + chunk_size
+                        rows = list(zip(
+                            tickers[i:end].tolist(),
+                            day_numbers[i:end].tolist(),
+                            *[col[i:end].to_numpy(dtype=object, na_value=None) for col in values]
+                        ))
+                        cursor.executemany(INSERT_STOCK_DATA_SQL, rows)
+                        inserted_count += len(rows)
+
+                        if (i // chunk_size + 1) % 10 == 0:
+                            logger.info(f"Processed {i + len(rows)} / {total_rows} rows")
+
+                    if rebuild_date_index:
+                        cursor.execute(CREATE_DATE_INDEX_SQL)
+
+                    cursor.execute(BUMP_DATA_VERSION_SQL)
+                    raw_conn.commit()
+                except Exception:
+                    raw_conn.rollback()
+                    raise
+                finally:
+                    if fast_ingest:
+                        # Shared writer connection - restore normal durability for later writes
+                        raw_conn.cursor().execute("PRAGMA synchronous = NORMAL")
+                    raw_conn.close()
+
+            # Latest dates changed - drop cached results
+            self.invalidate_caches()
 
             logger.info(f"Successfully inserted {inserted_count} rows")
             return inserted_count > 0
@@ -172,24 +435,25 @@ class DatabaseManager:
 
     def get_stock_data(self, ticker: Optional[str] = None) -> pd.DataFrame:
         """Retrieve stock data"""
-        if not self.is_initialized:
-            self.initialize()
-
         try:
-            query = "SELECT * FROM stock_data"
-            params = {}
-
-            if ticker:
-                query += " WHERE ticker = :ticker"
-                params["ticker"] = ticker
-
-            query += " ORDER BY ticker, date"
-
-            with self.engine.connect() as conn:
-                df = pd.read_sql(text(query), conn, params=params)
+            df = None
+            if CONNECTORX_AVAILABLE and not ticker:
+                # Unfiltered scans are the large ones - connectorx takes no bound parameters,
+                # so single-ticker reads stay on the SQLAlchemy path
+                try:
+                    df = cx.read_sql(f"sqlite://{self.db_path}", ALL_STOCK_DATA_SQL, return_type="pandas")
+                except Exception as e:
+                    logger.warning(f"connectorx read failed, falling back to read_sql: {e}")
+
+            if df is None:
+                with self.conn() as conn:
+                    if ticker:
+                        df = pd.read_sql(TICKER_STOCK_DATA_QUERY, conn, params={"ticker": ticker})
+                    else:
+                        df = pd.read_sql(ALL_STOCK_DATA_QUERY, conn)
 
             if not df.empty and 'date' in df.columns:
-                df["date"] = pd.to_datetime(df["date"])
+                df["date"] = pd.to_datetime(df["date"], unit='D')
 
             return df
 
@@ -197,26 +461,39 @@ class DatabaseManager:
             logger.error(f"Data retrieval failed: {e}")
             return pd.DataFrame()
 
+    def iter_stock_data(self, ticker: Optional[str] = None, chunksize: int = 200_000) -> Iterator[pd.DataFrame]:
+        """
+        Stream stock data in DataFrame chunks, so peak memory stays O(chunksize)
+
+        Args:
+            ticker: Optional ticker symbol, all stocks when None
+            chunksize: Rows per yielded DataFrame
+
+        Yields:
+            DataFrames with the same columns as get_stock_data, in (ticker, date) order
+        """
+        if ticker:
+            query, params = TICKER_STOCK_DATA_QUERY, {"ticker": ticker}
+        else:
+            query, params = ALL_STOCK_DATA_QUERY, None
+
+        with self.conn() as conn:
+            # Epoch days parsed per chunk inside read_sql, no second pass over the frame
+            yield from pd.read_sql(query, conn, params=params, chunksize=chunksize,
+                                   parse_dates={"date": {"unit": "D"}})
+
     def get_database_stats(self) -> Dict[str, Any]:
-        """Get database statistics"""
-        if not self.is_initialized:
-            self.initialize()
+        """Get database statistics (cached for STATS_TTL seconds)"""
+        cached = self._cached_stats(('database',))
+        if cached is not None:
+            return dict(cached)
 
         try:
-            with self.engine.connect() as conn:
-                stats_query = text("""
-                    SELECT
-                        COUNT(*) as total_records,
-                        COUNT(DISTINCT ticker) as unique_tickers,
-                        MIN(date) as earliest_date,
-                        MAX(date) as latest_date
-                    FROM stock_data
-                """)
-
-                result = conn.execute(stats_query).fetchone()
+            with self.conn() as conn:
+                result = conn.execute(DATABASE_STATS_QUERY).fetchone()
                 db_size_mb = self.db_path.stat().st_size / (1024 * 1024) if self.db_path.exists() else 0
 
-                return {
+                stats = {
                     'total_records': result[0] if result and result[0] else 0,
                     'unique_tickers': result[1] if result and result[1] else 0,
                     'earliest_date': result[2] if result else None,
@@ -225,47 +502,53 @@ class DatabaseManager:
                     'database_path': str(self.db_path)
                 }
 
+            self._stats_cache[('database',)] = (time.monotonic(), stats)
+            return dict(stats)
+
         except Exception as e:
             logger.error(f"Stats retrieval failed: {e}")
             return {'total_records': 0, 'unique_tickers': 0, 'database_size_mb': 0}
 
+    def get_data_version(self) -> Optional[int]:
+        """Counter bumped by every write through this manager (None if it can't be read)"""
+        try:
+            with self.conn() as conn:
+                return conn.execute(DATA_VERSION_QUERY).scalar()
+
+        except Exception as e:
+            logger.error(f"Failed to read data version: {e}")
+            return None
+
     def get_latest_dates(self, tickers: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
-        """Get the latest date for each ticker in the database"""
-        if not self.is_initialized:
-            self.initialize()
+        """Get the latest date for each ticker in the database (cached for LATEST_DATES_TTL seconds)"""
+        cache_key = tuple(sorted(tickers)) if tickers else None
+        cached = self._latest_dates_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < LATEST_DATES_TTL:
+            return dict(cached[1])
 
         try:
-            with self.engine.connect() as conn:
+            with self.conn() as conn:
                 if tickers:
-                    # Create proper parameter binding for SQLAlchemy
-                    placeholders = ','.join([f':ticker{i}' for i in range(len(tickers))])
-                    query = text(f"""
-                        SELECT ticker, MAX(date) as latest_date
-                        FROM stock_data
-                        WHERE ticker IN ({placeholders})
-                        GROUP BY ticker
-                    """)
-
-                    params = {f'ticker{i}': ticker for i, ticker in enumerate(tickers)}
-                    result = conn.execute(query, params).fetchall()
+                    # Stage the wanted tickers in a per-connection temp table and join - the SQL
+                    # text stays the same for every call and there is no bound-parameter limit
+                    conn.execute(CREATE_WANTED_TICKERS_SQL)
+                    conn.execute(CLEAR_WANTED_TICKERS_SQL)
+                    conn.execute(INSERT_WANTED_TICKER_SQL, [{'ticker': ticker} for ticker in tickers])
+                    result = conn.execute(WANTED_LATEST_DATES_QUERY).fetchall()
 
                     # Initialize with all requested tickers
                     latest_dates = {ticker: None for ticker in tickers}
                 else:
                     # Get all tickers
-                    query = text("""
-                        SELECT ticker, MAX(date) as latest_date
-                        FROM stock_data
-                        GROUP BY ticker
-                    """)
-                    result = conn.execute(query).fetchall()
+                    result = conn.execute(ALL_LATEST_DATES_QUERY).fetchall()
                     latest_dates = {}
 
                 # Populate results
                 for ticker, latest_date in result:
                     latest_dates[ticker] = latest_date
 
-                return latest_dates
+                self._latest_dates_cache[cache_key] = (time.monotonic(), latest_dates)
+                return dict(latest_dates)
 
         except Exception as e:
             logger.error(f"Failed to get latest dates: {e}")
@@ -273,7 +556,7 @@ class DatabaseManager:
 
     def get_stock_data_stats(self, ticker: Optional[str] = None) -> pd.DataFrame:
         """
-        Get data completeness statistics per stock
+        Get data completeness statistics per stock (cached for STATS_TTL seconds)
 
         Args:
             ticker: Optional ticker symbol to get stats for specific stock
@@ -287,51 +570,76 @@ class DatabaseManager:
             - total_records: Total number of records
             - completeness_pct: Completeness percentage
         """
-        if not self.is_initialized:
-            self.initialize()
+        cache_key = ('stocks', ticker or None)
+        cached = self._cached_stats(cache_key)
+        if cached is not None:
+            return cached.copy()
 
         try:
-            query = """
-                SELECT
-                    ticker,
-                    MIN(date) as first_date,
-                    MAX(date) as last_date,
-                    COUNT(*) as total_records
-                FROM stock_data
-            """
-
-            params = {}
-            if ticker:
-                query += " WHERE ticker = :ticker"
-                params["ticker"] = ticker
-
-            query += " GROUP BY ticker ORDER BY ticker"
-
-            with self.engine.connect() as conn:
-                df = pd.read_sql(text(query), conn, params=params)
+            with self.conn() as conn:
+                if ticker:
+                    df = pd.read_sql(TICKER_STOCK_DATA_STATS_QUERY, conn, params={"ticker": ticker})
+                else:
+                    df = pd.read_sql(ALL_STOCK_DATA_STATS_QUERY, conn)
 
             if not df.empty:
-                # Convert date strings to datetime
-                df['first_date'] = pd.to_datetime(df['first_date'])
-                df['last_date'] = pd.to_datetime(df['last_date'])
+                # Span in days straight from the epoch-day integers
+                span_days = (df['last_date'] - df['first_date']).to_numpy(dtype=np.float64)
 
-                # Calculate completeness percentage (approximate)
-                # Assumes ~252 trading days per year
-                def calculate_completeness(row):
-                    years = (row['last_date'] - row['first_date']).days / 365.25
-                    expected = years * 252  # Approximate trading days
-                    if expected > 0:
-                        completeness = (row['total_records'] / expected) * 100
-                        return min(completeness, 100.0)  # Cap at 100%
-                    return 100.0
+                # Convert epoch days to datetime
+                df['first_date'] = pd.to_datetime(df['first_date'], unit='D')
+                df['last_date'] = pd.to_datetime(df['last_date'], unit='D')
 
-                df['completeness_pct'] = df.apply(calculate_completeness, axis=1)
+                # Calculate completeness percentage (approximate), vectorized
+                # Assumes ~252 trading days per year
+                expected = span_days / 365.25 * 252  # Approximate trading days
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    completeness = df['total_records'].to_numpy(dtype=np.float64) / expected * 100
+                df['completeness_pct'] = np.where(expected > 0, np.minimum(completeness, 100.0), 100.0)  # Cap at 100%
 
-            return df
+            self._stats_cache[cache_key] = (time.monotonic(), df)
+            return df.copy()
 
         except Exception as e:
             logger.error(f"Failed to get stock data stats: {e}")
             return pd.DataFrame()
 
+    def count_records(self, tickers: List[str]) -> Dict[str, int]:
+        """
+        Count stored records for several tickers in one query
+
+        Returns:
+            Dict of ticker -> record count, tickers without data are left out
+        """
+        if not tickers:
+            return {}
+
+        try:
+            with self.conn() as conn:
+                return dict(conn.execute(COUNT_TICKER_RECORDS_QUERY, {'tickers': list(tickers)}).fetchall())
+
+        except Exception as e:
+            logger.error(f"Failed to count records: {e}")
+            return {}
+
+    def delete_tickers(self, tickers: List[str]) -> int:
+        """
+        Delete all data for the given tickers in one statement and transaction
+
+        Returns:
+            Number of rows deleted (raises on failure, nothing is deleted then)
+        """
+        if not tickers:
+            return 0
+
+        with self.write_conn() as conn:
+            result = conn.execute(DELETE_TICKERS_SQL, {'tickers': list(tickers)})
+            conn.execute(text(BUMP_DATA_VERSION_SQL))
+            conn.commit()
+
+        # Latest dates changed - drop cached results
+        self.invalidate_caches()
+        return result.rowcount
+
 # Global instance
 db_manager = DatabaseManager()
\ No newline at end of file
@@ -3,6 +3,9 @@ Data viewing component - with working search box and autocomplete
 Replace in: src/gui/components/data_viewer.py
 """
 
+import bisect
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk
@@ -12,16 +15,65 @@ from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Milliseconds of typing pause before the ticker search runs
+SEARCH_DEBOUNCE_MS = 120
+
+# Rows inserted into the table at a time - more are appended as the user scrolls near the end
+ROW_WINDOW = 200
+
+# Prepared (sorted/limited) views kept for quick re-selection, least recently used evicted
+VIEW_CACHE_SIZE = 16
+
+def _downcast_volume(data: pd.DataFrame) -> pd.DataFrame:
+    """Narrow volume to the smallest int that holds it - prices stay float64, float32 would change their rounding"""
+    # Stays float64 when volumes are missing (NaN has no integer form)
+    return data.assign(volume=pd.to_numeric(data['volume'], downcast='integer'))
+
+def _format_dates(values: pd.Series) -> pd.Series:
+    """YYYY-MM-DD strings, '' for missing dates"""
+    return values.dt.strftime('%Y-%m-%d').fillna('')
+
+def _format_prices(values: pd.Series) -> pd.Series:
+    """Two-decimal strings, '' for missing prices"""
+    return values.map('{:.2f}'.format, na_action='ignore').fillna('')
+
+def _format_volumes(values: pd.Series) -> pd.Series:
+    """Thousands-separated integers, '' for missing volumes"""
+    return values.map('{:,.0f}'.format, na_action='ignore').fillna('')
+
+def _format_rows(data: pd.DataFrame) -> list:
+    """Table rows (date, open, high, low, close, volume) as display strings, formatted per column"""
+    columns = [
+        _format_dates(data['date']),
+        *[_format_prices(data[col]) for col in ('open', 'high', 'low', 'close')],
+        _format_volumes(data['volume'])
+    ]
+    # Zip the plain object arrays in one pass - no per-row Series iteration
+    return list(zip(*[col.to_numpy(dtype=object) for col in columns]))
+
 class DataViewer:
     """Data viewer component with search functionality"""
 
     def __init__(self, parent):
         self.parent = parent
         self.current_data = pd.DataFrame()
+        self._ticker_rows = {}  # ticker -> row positions in current_data, built once per update_data
         self.all_tickers = []
         self.filtered_tickers = []
         self.frame = ctk.CTkFrame(parent)
-        self.suggestions_window = None
+        self.suggestions_window = None  # Created once, then shown/withdrawn
+        self.suggestions_listbox = None
+        self._suggestions_visible = False
+        self._search_after_id = None
+        self._display_data = None  # Sorted rows of the current view, inserted ROW_WINDOW at a time
+        self._rows_loaded = 0
+        self._append_after_id = None
+        self._last_view_key = None  # (ticker, show_all) currently in the table
+        self._pending_view_key = None  # (ticker, show_all) being prepared in the background
+        self._view_future = None
+        self._view_cache = OrderedDict()  # (ticker, show_all) -> prepared view, oldest first
+        # One worker - filter/sort off the Tk main loop, results are applied via after()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="data-viewer")
         self.setup_ui()
 
     def setup_ui(self):
@@ -96,16 +148,23 @@ class DataViewer:
                 self.tree.column(col, width=80, anchor='e')
 
         # Scrollbars
-        v_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        self.v_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
         h_scrollbar = ttk.Scrollbar(table_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll, xscrollcommand=h_scrollbar.set)
 
         # Pack layout
         self.tree.pack(side="left", fill="both", expand=True)
-        v_scrollbar.pack(side="right", fill="y")
+        self.v_scrollbar.pack(side="right", fill="y")
 
     def on_search_changed(self, event=None):
-        """Handle search text changes - show suggestions"""
+        """Handle search text changes - search once typing pauses for SEARCH_DEBOUNCE_MS"""
+        if self._search_after_id:
+            self.frame.after_cancel(self._search_after_id)
+        self._search_after_id = self.frame.after(SEARCH_DEBOUNCE_MS, self.run_search)
+
+    def run_search(self):
+        """Filter tickers for the current search text and show suggestions"""
+        self._search_after_id = None
         search_text = self.ticker_search.get().strip().upper()
 
         if not search_text:
@@ -113,11 +172,16 @@ class DataViewer:
             self.info_label.configure(text="Type to search for a ticker")
             return
 
-        # Filter tickers based on search text
-        self.filtered_tickers = [
-            ticker for ticker in self.all_tickers
-            if search_text in ticker
-        ]
+        # Prefix matches straight from the sorted ticker list (O(log N)), substring scan
+        # only when nothing starts with the search text
+        lo = bisect.bisect_left(self.all_tickers, search_text)
+        hi = bisect.bisect_left(self.all_tickers, search_text + '\uffff', lo)
+        self.filtered_tickers = self.all_tickers[lo:hi]
+        if not self.filtered_tickers:
+            self.filtered_tickers = [
+                ticker for ticker in self.all_tickers
+                if search_text in ticker
+            ]
 
         if self.filtered_tickers:
             self.show_suggestions(self.filtered_tickers[:10])  # Show max 10 suggestions
@@ -133,13 +197,9 @@ class DataViewer:
 
     def show_suggestions(self, suggestions):
         """Show autocomplete suggestions in a toplevel window"""
-        # Destroy existing suggestions window
-        if self.suggestions_window:
-            self.suggestions_window.destroy()
-
-        # Create new toplevel window for suggestions
-        self.suggestions_window = tk.Toplevel(self.frame)
-        self.suggestions_window.wm_overrideredirect(True)  # Remove window decorations
+        # Reuse the suggestions window - only its contents and position change per search
+        if self.suggestions_window is None:
+            self.create_suggestions_window()
 
         # Position below the search entry
         x = self.ticker_search.winfo_rootx()
@@ -148,6 +208,23 @@ class DataViewer:
 
         self.suggestions_window.geometry(f"{width}x150+{x}+{y}")
 
+        # Populate with suggestions
+        self.suggestions_listbox.delete(0, tk.END)
+        self.suggestions_listbox.insert(tk.END, *suggestions)
+
+        # Select first item by default
+        if suggestions:
+            self.suggestions_listbox.selection_set(0)
+            self.suggestions_listbox.activate(0)
+
+        self.suggestions_window.deiconify()
+        self._suggestions_visible = True
+
+    def create_suggestions_window(self):
+        """Create the suggestions toplevel window and its listbox"""
+        self.suggestions_window = tk.Toplevel(self.frame)
+        self.suggestions_window.wm_overrideredirect(True)  # Remove window decorations
+
         # Create listbox in suggestions window
         suggestions_frame = tk.Frame(self.suggestions_window, bg="#2b2b2b", bd=1, relief="solid")
         suggestions_frame.pack(fill="both", expand=True)
@@ -170,26 +247,17 @@ class DataViewer:
         self.suggestions_listbox.config(yscrollcommand=scrollbar.set)
         scrollbar.config(command=self.suggestions_listbox.yview)
 
-        # Populate with suggestions
-        for ticker in suggestions:
-            self.suggestions_listbox.insert(tk.END, ticker)
-
         # Bind events
         self.suggestions_listbox.bind('<<ListboxSelect>>', self.on_suggestion_select)
         self.suggestions_listbox.bind('<Return>', self.on_suggestion_select)
         self.suggestions_listbox.bind('<Escape>', lambda e: self.hide_suggestions())
         self.suggestions_listbox.bind('<FocusOut>', self.delayed_hide_suggestions)
 
-        # Select first item by default
-        if suggestions:
-            self.suggestions_listbox.selection_set(0)
-            self.suggestions_listbox.activate(0)
-
     def hide_suggestions(self):
         """Hide autocomplete suggestions"""
-        if self.suggestions_window:
-            self.suggestions_window.destroy()
-            self.suggestions_window = None
+        if self.suggestions_window is not None:
+            self.suggestions_window.withdraw()
+        self._suggestions_visible = False
 
     def delayed_hide_suggestions(self, event=None):
         """Hide suggestions after a short delay (allows clicking on suggestions)"""
@@ -197,12 +265,17 @@ class DataViewer:
 
     def focus_suggestions(self, event=None):
         """Move focus to suggestions listbox"""
-        if self.suggestions_window and self.suggestions_listbox:
+        if self._suggestions_visible:
             self.suggestions_listbox.focus_set()
             return "break"
 
     def on_search_enter(self, event=None):
         """Handle Enter key - select first suggestion or exact match"""
+        if self._search_after_id:
+            # Enter pressed within the debounce delay - filter for the current text first
+            self.frame.after_cancel(self._search_after_id)
+            self.run_search()
+
         search_text = self.ticker_search.get().strip().upper()
 
         if not search_text:
@@ -244,18 +317,33 @@ class DataViewer:
         """Clear search box and table"""
         self.ticker_search.delete(0, tk.END)
         self.hide_suggestions()
-        self.tree.delete(*self.tree.get_children())
+        self.reset_table()
         self.info_label.configure(text="Type to search for a ticker")
         self.ticker_search.focus_set()
 
     def update_data(self, data: pd.DataFrame):
         """Update the displayed data"""
         try:
+            # Categorical ticker - one small code per row instead of a Python string object
+            if not data.empty and not isinstance(data['ticker'].dtype, pd.CategoricalDtype):
+                data = data.assign(ticker=data['ticker'].astype('category'))
+
+            # Narrower volume column - fewer bytes for every take/sort/format afterwards
+            if not data.empty:
+                data = _downcast_volume(data)
             self.current_data = data
+            self._last_view_key = None  # New data - the next selection must redraw
+            self._pending_view_key = None
+            self._view_cache.clear()
+
+            # Group once, so selecting a ticker doesn't rescan the whole dataset
+            self._ticker_rows = data.groupby('ticker', sort=False, observed=True).indices if not data.empty else {}
 
             # Update ticker list
             if not data.empty:
-                self.all_tickers = sorted(data['ticker'].unique().tolist())
+                # Categories are the distinct tickers already - no per-row unique() + Python sort
+                tickers = data['ticker'].cat.remove_unused_categories().cat.categories
+                self.all_tickers = tickers.sort_values().tolist()
                 self.info_label.configure(
                     text=f"Loaded {len(self.all_tickers)} tickers, {len(data):,} total records"
                 )
@@ -270,62 +358,137 @@ class DataViewer:
     def update_table_view(self, ticker=None):
         """Update table view with current data"""
         try:
-            # Clear existing data
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-
             # Get ticker from search box if not provided
             if ticker is None:
                 ticker = self.ticker_search.get().strip().upper()
 
+            # Same ticker and options as the table already shows - nothing to rebuild
+            view_key = (ticker, self.show_all_var.get())
+            if view_key == self._last_view_key or view_key == self._pending_view_key:
+                return
+
+            # Clear existing data
+            self.reset_table()
+
             if not ticker or self.current_data.empty:
                 return
 
-            ticker_data = self.current_data[self.current_data['ticker'] == ticker].copy()
-            if ticker_data.empty:
+            # Viewed recently - no need to take/sort again
+            cached = self._view_cache.get(view_key)
+            if cached is not None:
+                self._view_cache.move_to_end(view_key)
+                self.render_view(view_key, cached)
+                return
+
+            rows = self._ticker_rows.get(ticker)
+            if rows is None:
                 self.info_label.configure(text=f"No data found for {ticker}")
                 return
 
-            ticker_data = ticker_data.sort_values('date', ascending=False)
+            # Supersede any preparation still queued for an earlier selection
+            if self._view_future is not None:
+                self._view_future.cancel()
 
-            # Determine how many records to show
-            show_all = self.show_all_var.get()
-            if show_all:
-                display_data = ticker_data
-                limit_text = "all"
-            else:
-                display_data = ticker_data.head(2000)
-                limit_text = "latest 2000"
-
-            # Add data to tree
-            record_count = 0
-            for _, row in display_data.iterrows():
-                values = [
-                    row['date'].strftime('%Y-%m-%d') if pd.notna(row['date']) else '',
-                    f"{row['open']:.2f}" if pd.notna(row['open']) else '',
-                    f"{row['high']:.2f}" if pd.notna(row['high']) else '',
-                    f"{row['low']:.2f}" if pd.notna(row['low']) else '',
-                    f"{row['close']:.2f}" if pd.notna(row['close']) else '',
-                    f"{int(row['volume']):,}" if pd.notna(row['volume']) else ''
-                ]
-                self.tree.insert('', 'end', values=values)
-                record_count += 1
-
-                # Progress indicator for large datasets
-                if record_count % 1000 == 0:
-                    self.info_label.configure(text=f"Loading {ticker}: {record_count:,} records...")
-                    self.frame.update_idletasks()
+            self._pending_view_key = view_key
+            self.info_label.configure(text=f"Loading {ticker}...")
+
+            future = self._executor.submit(self.prepare_view, self.current_data, rows, view_key[1])
+            future.add_done_callback(lambda f: self.frame.after(0, self.show_view, view_key, f))
+            self._view_future = future
+
+        except Exception as e:
+            logger.error(f"Failed to update table view: {e}")
+            self.info_label.configure(text=f"Error loading data: {e}")
+
+    @staticmethod
+    def prepare_view(data: pd.DataFrame, rows, show_all: bool):
+        """Select and sort one ticker's rows - runs on the worker thread"""
+        ticker_data = data.take(rows).sort_values('date', ascending=False)
+
+        # Determine how many records to show
+        display_data = ticker_data if show_all else ticker_data.head(2000)
+
+        date_range = f"{ticker_data['date'].min().date()} to {ticker_data['date'].max().date()}"
+        return display_data, len(ticker_data), date_range
+
+    def show_view(self, view_key, future: Future):
+        """Put a prepared view into the table - runs on the Tk main loop"""
+        # Cancelled, or the user moved on (or the data was reloaded) while it was prepared
+        if future.cancelled() or view_key != self._pending_view_key:
+            return
+        self._pending_view_key = None
+
+        try:
+            view = future.result()
+        except Exception as e:
+            logger.error(f"Failed to update table view: {e}")
+            self.info_label.configure(text=f"Error loading data: {e}")
+            return
+
+        self._view_cache[view_key] = view
+        if len(self._view_cache) > VIEW_CACHE_SIZE:
+            self._view_cache.popitem(last=False)
+
+        self.render_view(view_key, view)
+
+    def render_view(self, view_key, view):
+        """Fill the table from a prepared view (display_data, total_records, date_range)"""
+        try:
+            display_data, total_records, date_range = view
+
+            # Add the first window to the tree, the rest follows as the user scrolls
+            self._display_data = display_data
+            self.append_rows()
 
             # Final info update
-            date_range = f"{ticker_data['date'].min().date()} to {ticker_data['date'].max().date()}"
+            limit_text = "all" if view_key[1] else "latest 2000"
             self.info_label.configure(
-                text=f"{len(ticker_data):,} total records ({date_range}) - showing {limit_text}"
+                text=f"{total_records:,} total records ({date_range}) - showing {limit_text}"
             )
+            self._last_view_key = view_key
 
         except Exception as e:
             logger.error(f"Failed to update table view: {e}")
             self.info_label.configure(text=f"Error loading data: {e}")
 
+    def reset_table(self):
+        """Remove all rows and forget the current view"""
+        if self._append_after_id:
+            self.frame.after_cancel(self._append_after_id)
+            self._append_after_id = None
+        self.tree.delete(*self.tree.get_children())
+        self._display_data = None
+        self._rows_loaded = 0
+        self._last_view_key = None
+        self._pending_view_key = None  # Drops a preparation still in flight
+
+    def append_rows(self):
+        """Insert the next ROW_WINDOW rows of the current view"""
+        self._append_after_id = None
+        if self._display_data is None:
+            return
+
+        start = self._rows_loaded
+        window = self._display_data.iloc[start:start + ROW_WINDOW]
+        if window.empty:
+            return
+
+        # Columns are formatted whole, the loop only inserts ready-made strings
+        # (bound method hoisted - no attribute lookups per row)
+        tree_insert = self.tree.insert
+        for values in _format_rows(window):
+            tree_insert('', 'end', values=values)
+        self._rows_loaded = start + len(window)
+
+    def on_tree_scroll(self, first, last):
+        """Treeview yscrollcommand - update the scrollbar and load more rows near the end"""
+        self.v_scrollbar.set(first, last)
+
+        if (self._display_data is not None and self._append_after_id is None
+                and float(last) > 0.9 and self._rows_loaded < len(self._display_data)):
+            # Deferred - inserting from inside the scroll callback would re-enter it
+            self._append_after_id = self.frame.after_idle(self.append_rows)
+
     def on_show_all_change(self):
         """Handle show all data checkbox change"""
         ticker = self.ticker_search.get().strip().upper()
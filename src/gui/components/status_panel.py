@@ -5,11 +5,9 @@ Simple status monitoring panel - Fixed Last Updated Tracking
 import customtkinter as ctk
 import tkinter as tk
 from typing import Dict, Any
-from datetime import datetime
-import os
-import json
 
 from ...utils.logger import get_logger
+from ...utils.last_update import load_last_update, save_last_update
 from ...core.database_manager import db_manager
 
 logger = get_logger(__name__)
@@ -21,10 +19,6 @@ class StatusPanel:
         self.parent = parent
         self.frame = ctk.CTkFrame(parent)
         
-        # Path for storing last update info
-        self.app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-        self.status_file = os.path.join(self.app_dir, 'data', 'last_update.json')
-        
         self.setup_ui()
         
     def setup_ui(self):
@@ -46,7 +40,7 @@ class StatusPanel:
         refresh_button = ctk.CTkButton(
             self.frame,
             text="Refresh",
-            command=self.refresh_status,
+            command=self.on_refresh_click,
             height=30
         )
         refresh_button.pack(padx=10, pady=10, fill="x")
@@ -57,16 +51,15 @@ class StatusPanel:
     def get_last_update_time(self):
         """Get the last update time from file - DATE ONLY"""
         try:
-            if os.path.exists(self.status_file):
-                with open(self.status_file, 'r') as f:
-                    data = json.load(f)
-                    full_timestamp = data.get('last_update', 'Never')
-                    
-                    # Extract only the date part (YYYY-MM-DD)
-                    if full_timestamp != 'Never' and len(full_timestamp) >= 10:
-                        return full_timestamp[:16]  # Get first 10 characters (date part)
-                    return full_timestamp
-            return 'Never'
+            data = load_last_update()
+            if data is None:
+                return 'Never'
+            full_timestamp = data.get('last_update', 'Never')
+            
+            # Extract only the date part (YYYY-MM-DD)
+            if full_timestamp != 'Never' and len(full_timestamp) >= 10:
+                return full_timestamp[:16]  # Get first 10 characters (date part)
+            return full_timestamp
         except Exception as e:
             logger.warning(f"Could not read last update time: {e}")
             return 'Never'
@@ -74,20 +67,7 @@ class StatusPanel:
     def save_last_update_time(self, update_time=None):
         """Save the last update time to file"""
         try:
-            # Ensure data directory exists
-            os.makedirs(os.path.dirname(self.status_file), exist_ok=True)
-            
-            if update_time is None:
-                update_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            data = {
-                'last_update': update_time,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            with open(self.status_file, 'w') as f:
-                json.dump(data, f, indent=2)
-                
+            update_time = save_last_update(update_time)
             logger.info(f"Saved last update time: {update_time}")
             
         except Exception as e:
@@ -127,6 +107,11 @@ Connection: {'✅ Active' if connection_active else '❌ Inactive'}
         except Exception as e:
             logger.error(f"Failed to update status: {e}")
     
+    def on_refresh_click(self):
+        """Refresh button - re-query even if another process wrote since the stats were cached"""
+        db_manager.invalidate_caches()
+        self.refresh_status()
+
     def refresh_status(self):
         """Refresh status from database"""
         try:
@@ -139,5 +124,6 @@ Connection: {'✅ Active' if connection_active else '❌ Inactive'}
     
     def mark_data_updated(self):
         """Call this method when data is successfully updated"""
+        db_manager.invalidate_caches()  # Cached stats predate the update
         self.save_last_update_time()
         self.refresh_status()  # Refresh display to show new update time
\ No newline at end of file
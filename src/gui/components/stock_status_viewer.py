@@ -3,9 +3,11 @@ Stock-wise status viewer component for GUI - Enhanced with Missing Days
 Shows data availability status for each company including missing days count
 """
 
+from concurrent.futures import ThreadPoolExecutor, Future
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk
+import numpy as np
 import pandas as pd
 
 from ...utils.logger import get_logger
@@ -13,6 +15,13 @@ from ...core.database_manager import db_manager
 
 logger = get_logger(__name__)
 
+# Treeview columns in display order, precomputed once per refresh so filtering only selects rows
+DISPLAY_COLUMNS = ['symbol', 'status_icon', 'records_str', 'earliest_date', 'latest_date',
+                   'range_str', 'completeness_str', 'missing_str']
+
+# Rows inserted into the tree per batch - more are appended as the user scrolls near the end
+ROW_WINDOW = 200
+
 class StockStatusViewer:
     """Component to display stock-wise data availability status"""
 
@@ -20,6 +29,12 @@ class StockStatusViewer:
         self.parent = parent
         self.frame = ctk.CTkFrame(parent)
         self.status_data = pd.DataFrame()
+        self._filtered_data = None  # Rows matching the current filter, inserted ROW_WINDOW at a time
+        self._rows_loaded = 0
+        self._append_after_id = None
+        self._refreshing = False  # A status query is running on the worker thread
+        self._refresh_pending = False  # Another refresh was requested meanwhile (e.g. after a delete)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="status-viewer")
         self.setup_ui()
 
     def setup_ui(self):
@@ -52,7 +67,7 @@ class StockStatusViewer:
         refresh_btn = ctk.CTkButton(
             header_frame,
             text="Refresh Status",
-            command=self.refresh_status,
+            command=self.on_refresh_click,
             height=32,
             width=120
         )
@@ -138,13 +153,13 @@ class StockStatusViewer:
         missing_days_info_btn.pack(side="right", padx=5)
 
         # Scrollbars
-        v_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        self.v_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
         h_scrollbar = ttk.Scrollbar(table_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll, xscrollcommand=h_scrollbar.set)
 
         # Pack layout
         self.tree.grid(row=0, column=0, sticky='nsew')
-        v_scrollbar.grid(row=0, column=1, sticky='ns')
+        self.v_scrollbar.grid(row=0, column=1, sticky='ns')
         h_scrollbar.grid(row=1, column=0, sticky='ew')
 
         table_frame.grid_rowconfigure(0, weight=1)
@@ -182,69 +197,100 @@ class StockStatusViewer:
             command=self.apply_filter
         ).pack(side="left", padx=5)
 
+    def on_refresh_click(self):
+        """Refresh Status button - re-query even if another process wrote since the stats were cached"""
+        db_manager.invalidate_caches()
+        self.refresh_status()
+
     def refresh_status(self):
-        """Refresh status data from database using new stats methods"""
-        try:
-            logger.info("Refreshing stock status data with completeness stats...")
+        """Refresh status data from database - the query runs on the worker thread"""
+        if self._refreshing:
+            # Rerun once the current query is done so its result isn't stale
+            self._refresh_pending = True
+            return
 
-            # Get comprehensive stats from database
-            stats_df = db_manager.get_stock_data_stats()
+        logger.info("Refreshing stock status data with completeness stats...")
+        self._refreshing = True
+        self._refresh_pending = False
+
+        future = self._executor.submit(self.load_status)
+        future.add_done_callback(lambda f: self.frame.after(0, self.show_status, f))
+
+    @staticmethod
+    def load_status() -> pd.DataFrame:
+        """Query completeness stats and build the display table - runs on the worker thread"""
+        # Get comprehensive stats from database
+        stats_df = db_manager.get_stock_data_stats()
+
+        if stats_df.empty:
+            return pd.DataFrame()
+
+        # Convert to format expected by display - whole columns at once
+        # Calculate missing days (approximate), ~252 trading days/year
+        years = (stats_df['last_date'] - stats_df['first_date']).dt.days / 365.25
+        expected_days = (years * 252).astype('int64')
+        actual_days = stats_df['total_records']
+
+        data = pd.DataFrame({
+            'symbol': stats_df['ticker'],
+            'has_data': True,
+            'record_count': actual_days,
+            'earliest_date': stats_df['first_date'].dt.strftime('%Y-%m-%d'),
+            'latest_date': stats_df['last_date'].dt.strftime('%Y-%m-%d'),
+            'days_range': expected_days,
+            'completeness_pct': stats_df['completeness_pct'],
+            'missing_days': (expected_days - actual_days).clip(lower=0)
+        })
+
+        # Display strings, status icon and row tag for every symbol (adjusted for market holidays)
+        # 97%+ is considered complete (accounts for ~10-12 market holidays per year)
+        completeness = data['completeness_pct']
+        levels = [completeness >= 97, completeness >= 90]
+        data['status_icon'] = np.select(levels, ["✓", "⚠"], default="✗")
+        data['tag'] = np.select(levels, ['complete', 'good'], default='incomplete')
+        data['records_str'] = np.where(data['record_count'] > 0, data['record_count'].map('{:,}'.format), "-")
+        data['range_str'] = np.where(data['days_range'] > 0, data['days_range'].astype(str), "-")
+        data['completeness_str'] = completeness.map('{:.1f}%'.format)
+        data['missing_str'] = data['missing_days'].map('{:,}'.format)
+        return data
+
+    def show_status(self, future: Future):
+        """Put freshly loaded status data on screen - runs on the Tk main loop"""
+        self._refreshing = False
 
-            if stats_df.empty:
-                self.summary_label.configure(text="No data available")
-                logger.info("No data found in database")
-                return
-
-            # Convert to format expected by display
-            status_list = []
-
-            for _, row in stats_df.iterrows():
-                # Calculate missing days (approximate)
-                years = (row['last_date'] - row['first_date']).days / 365.25
-                expected_days = int(years * 252)  # ~252 trading days/year
-                actual_days = row['total_records']
-                missing_days = max(0, expected_days - actual_days)
-
-                completeness = row['completeness_pct']
-
-                status_list.append({
-                    'symbol': row['ticker'],
-                    'has_data': True,
-                    'record_count': row['total_records'],
-                    'earliest_date': row['first_date'].strftime('%Y-%m-%d'),
-                    'latest_date': row['last_date'].strftime('%Y-%m-%d'),
-                    'days_range': expected_days,
-                    'completeness_pct': completeness,
-                    'missing_days': missing_days
-                })
-
-            self.status_data = pd.DataFrame(status_list)
+        try:
+            self.status_data = future.result()
             self.update_display()
 
-            logger.info(f"Status refreshed for {len(stats_df)} symbols")
+            if self.status_data.empty:
+                logger.info("No data found in database")
+            else:
+                logger.info(f"Status refreshed for {len(self.status_data)} symbols")
 
         except Exception as e:
             logger.error(f"Failed to refresh status: {e}")
             self.summary_label.configure(text=f"Error: {e}")
 
+        if self._refresh_pending:
+            self.refresh_status()
+
     def update_display(self):
         """Update the display with current status data"""
         # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.reset_table()
 
         if self.status_data.empty:
             self.summary_label.configure(text="No data available")
             return
 
-        # Calculate summary
+        # Calculate summary - counts straight from the completeness array, no filtered frames
         total_symbols = len(self.status_data)
-        complete_stocks = len(self.status_data[self.status_data['completeness_pct'] >= 97])
-        good_stocks = len(self.status_data[(self.status_data['completeness_pct'] >= 90) &
-                                           (self.status_data['completeness_pct'] < 97)])
-        incomplete_stocks = len(self.status_data[self.status_data['completeness_pct'] < 90])
+        completeness = self.status_data['completeness_pct'].to_numpy()
+        complete_stocks = int(np.count_nonzero(completeness >= 97))
+        incomplete_stocks = int(np.count_nonzero(completeness < 90))
+        good_stocks = total_symbols - complete_stocks - incomplete_stocks
 
-        avg_completeness = self.status_data['completeness_pct'].mean()
+        avg_completeness = completeness.mean()
         total_missing = self.status_data['missing_days'].sum()
 
         # Update summary
@@ -264,8 +310,7 @@ class StockStatusViewer:
     def apply_filter(self):
         """Apply the selected filter to the display"""
         # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.reset_table()
 
         if self.status_data.empty:
             return
@@ -280,34 +325,45 @@ class StockStatusViewer:
         else:  # all
             filtered_data = self.status_data
 
-        # Populate tree
-        for _, row in filtered_data.iterrows():
-            completeness = row['completeness_pct']
-
-            # Determine status icon and tag (adjusted for market holidays)
-            # 97%+ is considered complete (accounts for ~10-12 market holidays per year)
-            if completeness >= 97:
-                status_icon = "✓"
-                tag = 'complete'
-            elif completeness >= 90:
-                status_icon = "⚠"
-                tag = 'good'
-            else:
-                status_icon = "✗"
-                tag = 'incomplete'
-
-            values = (
-                row['symbol'],
-                status_icon,
-                f"{row['record_count']:,}" if row['record_count'] > 0 else "-",
-                row['earliest_date'],
-                row['latest_date'],
-                str(row['days_range']) if row['days_range'] > 0 else "-",
-                f"{completeness:.1f}%",
-                f"{row['missing_days']:,}" if row['missing_days'] > 0 else "0"
-            )
+        # Populate tree with the first window, the rest is appended on scroll
+        self._filtered_data = filtered_data
+        self.append_rows()
+
+    def reset_table(self):
+        """Remove all rows and forget the current filtered data"""
+        if self._append_after_id:
+            self.frame.after_cancel(self._append_after_id)
+            self._append_after_id = None
+        self.tree.delete(*self.tree.get_children())
+        self._filtered_data = None
+        self._rows_loaded = 0
+
+    def append_rows(self):
+        """Insert the next ROW_WINDOW rows of the filtered data"""
+        self._append_after_id = None
+        if self._filtered_data is None:
+            return
 
-            self.tree.insert('', 'end', values=values, tags=(tag,))
+        start = self._rows_loaded
+        window = self._filtered_data.iloc[start:start + ROW_WINDOW]
+        if window.empty:
+            return
+
+        # Rows come from the preformatted columns
+        tree_insert = self.tree.insert
+        rows = window[DISPLAY_COLUMNS].itertuples(index=False, name=None)
+        for values, tag in zip(rows, window['tag'].tolist()):
+            tree_insert('', 'end', values=values, tags=(tag,))
+        self._rows_loaded = start + len(window)
+
+    def on_tree_scroll(self, first, last):
+        """Treeview yscrollcommand - update the scrollbar and load more rows near the end"""
+        self.v_scrollbar.set(first, last)
+
+        if (self._filtered_data is not None and self._append_after_id is None
+                and float(last) > 0.9 and self._rows_loaded < len(self._filtered_data)):
+            # Deferred - inserting from inside the scroll callback would re-enter it
+            self._append_after_id = self.frame.after_idle(self.append_rows)
 
     def load_initial_data(self):
         """Load initial status data"""
@@ -356,23 +412,16 @@ class StockStatusViewer:
             )
             return
 
-        # Collect symbols and their record counts
-        stocks_to_delete = []
-        total_records = 0
+        # Collect symbols and their record counts (one COUNT query for the whole selection)
+        # str() - Treeview hands back numeric-looking symbols as ints
+        symbols = [str(self.tree.item(selection)['values'][0]) for selection in selections]
+        record_counts = db_manager.count_records(symbols)
 
-        for selection in selections:
-            item = self.tree.item(selection)
-            symbol = item['values'][0]
-
-            stock_data = db_manager.get_stock_data(ticker=symbol)
-
-            if not stock_data.empty:
-                record_count = len(stock_data)
-                stocks_to_delete.append({
-                    'symbol': symbol,
-                    'records': record_count
-                })
-                total_records += record_count
+        stocks_to_delete = [
+            {'symbol': symbol, 'records': record_counts[symbol]}
+            for symbol in symbols if symbol in record_counts
+        ]
+        total_records = sum(stock['records'] for stock in stocks_to_delete)
 
         if not stocks_to_delete:
             messagebox.showinfo(
@@ -418,45 +467,19 @@ class StockStatusViewer:
             messagebox.showinfo("Cancelled", "Deletion cancelled.")
             return
 
-        # Perform deletion
-        deleted_count = 0
-        failed_stocks = []
-
+        # Perform deletion - one DELETE ... IN for all selected stocks, all or nothing
         try:
-            if not db_manager.is_initialized:
-                db_manager.initialize()
+            symbols = [stock['symbol'] for stock in stocks_to_delete]
+            logger.info(f"Deleting data for {stock_count} stocks ({total_records} records): {', '.join(symbols)}")
 
-            with db_manager.engine.connect() as conn:
-                from sqlalchemy import text
-
-                for stock in stocks_to_delete:
-                    symbol = stock['symbol']
-                    try:
-                        logger.info(f"Deleting data for {symbol} ({stock['records']} records)")
-
-                        delete_query = text("DELETE FROM stock_data WHERE ticker = :ticker")
-                        result = conn.execute(delete_query, {'ticker': symbol})
-                        deleted_count += result.rowcount
-
-                    except Exception as e:
-                        logger.error(f"Failed to delete {symbol}: {e}")
-                        failed_stocks.append(symbol)
-
-                conn.commit()
+            deleted_count = db_manager.delete_tickers(symbols)
 
             # Show results
-            if failed_stocks:
-                messagebox.showwarning(
-                    "Partial Success",
-                    f"Deleted {deleted_count:,} records.\n\n"
-                    f"Failed to delete: {', '.join(failed_stocks)}"
-                )
-            else:
-                logger.info(f"Successfully deleted {deleted_count} records for {stock_count} stocks")
-                messagebox.showinfo(
-                    "Deletion Complete",
-                    f"Successfully deleted {deleted_count:,} records for {stock_count} stock(s)"
-                )
+            logger.info(f"Successfully deleted {deleted_count} records for {stock_count} stocks")
+            messagebox.showinfo(
+                "Deletion Complete",
+                f"Successfully deleted {deleted_count:,} records for {stock_count} stock(s)"
+            )
 
             # Refresh the status display
             self.refresh_status()
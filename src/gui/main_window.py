@@ -11,7 +11,6 @@ from typing import Dict
 
 from ..config.settings import config
 from ..core.database_manager import db_manager
-from ..core.data_fetcher import data_fetcher
 from ..utils.logger import get_logger
 from .components.data_viewer import DataViewer
 from .components.status_panel import StatusPanel
@@ -21,6 +20,10 @@ from .components.stock_status_viewer import StockStatusViewer
 
 logger = get_logger(__name__, "GUI.log")
 
+# Tab holding the stock-wise status table, only populated while it is showing
+STATUS_TAB = "Stock-wise Status"
+DATA_TAB = "Data Viewer"
+
 class MainWindow:
     """Main application window"""
 
@@ -50,6 +53,7 @@ class MainWindow:
         # Initialize state variables
         self.current_data = pd.DataFrame()
         self.is_updating = False
+        self._status_stale = True  # Status table behind the database, refreshed when its tab is shown
 
         self.setup_ui()
 
@@ -109,7 +113,7 @@ class MainWindow:
         self.refresh_button = ctk.CTkButton(
             self.sidebar,
             text="Refresh View",
-            command=self.refresh_data,
+            command=self.on_refresh_click,
             height=35
         )
         self.refresh_button.grid(row=4, column=0, padx=20, pady=10, sticky="ew")
@@ -125,14 +129,17 @@ class MainWindow:
         self.main_frame.grid_rowconfigure(0, weight=1)
 
         # Use CTk tabview instead of ttk notebook
-        self.tabview = ctk.CTkTabview(self.main_frame)
+        self.tabview = ctk.CTkTabview(self.main_frame, command=self._refresh_status_if_visible)
         self.tabview.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
 
         # Add tabs
-        status_tab = self.tabview.add("Stock-wise Status")
-        data_tab = self.tabview.add("Data Viewer")
+        status_tab = self.tabview.add(STATUS_TAB)
+        data_tab = self.tabview.add(DATA_TAB)
         settings_tab = self.tabview.add("Settings")
 
+        # Open on the data viewer - the status table's query only runs once its tab is shown
+        self.tabview.set(DATA_TAB)
+
         # Create components in tabs
         self.settings_panel = SettingsPanel(settings_tab)
         self.settings_panel.frame.pack(fill="both", expand=True)
@@ -157,6 +164,11 @@ class MainWindow:
         # Load initial data
         self.root.after(1000, self.refresh_data)  # Load data after UI is fully initialized
 
+    def on_refresh_click(self):
+        """Refresh View button - re-query even if another process wrote since the stats were cached"""
+        db_manager.invalidate_caches()
+        self.refresh_data()
+
     def refresh_data(self):
         """Refresh the data display from database"""
         try:
@@ -167,13 +179,17 @@ class MainWindow:
             self.current_data = db_manager.get_stock_data()
 
             if not self.current_data.empty:
+                # Categorical ticker once - the data viewer's groupby and the ticker count below work on integer codes
+                self.current_data['ticker'] = self.current_data['ticker'].astype('category')
+
                 # Update data viewer
                 self.data_viewer.update_data(self.current_data)
 
-                self.stock_status_viewer.refresh_status()
+                self._status_stale = True
+                self._refresh_status_if_visible()
 
                 # Update status
-                unique_tickers = len(self.current_data['ticker'].unique())
+                unique_tickers = len(self.current_data['ticker'].cat.categories)
                 total_records = len(self.current_data)
                 latest_date = self.current_data['date'].max().strftime('%Y-%m-%d') if not self.current_data.empty else 'N/A'
 
@@ -196,6 +212,12 @@ class MainWindow:
             self.status_var.set(f"Error loading data: {str(e)}")
             messagebox.showerror("Refresh Error", f"Failed to refresh data:\n{str(e)}")
 
+    def _refresh_status_if_visible(self):
+        """Refresh the stock-wise status table if it is stale and its tab is selected"""
+        if self._status_stale and self.tabview.get() == STATUS_TAB:
+            self._status_stale = False
+            self.stock_status_viewer.refresh_status()
+
     def _start_update_thread(self, incremental=True):
         """Start update in background thread"""
         self.is_updating = True
@@ -227,6 +249,9 @@ class MainWindow:
     def _run_update(self, incremental=True):
         """Run update with specified mode"""
         try:
+            # Deferred: data_fetcher pulls in yfinance, only needed once an update runs
+            from ..core.data_fetcher import data_fetcher
+
             if incremental:
                 success, result = data_fetcher.update_stock_data(
                     update_callback=self._update_progress
@@ -336,6 +361,7 @@ class MainWindow:
             self.root.update_idletasks()
 
             # Get update plan
+            from ..core.data_fetcher import data_fetcher
             plan = data_fetcher.get_update_plan()
 
             # Format plan information
@@ -382,6 +408,7 @@ class MainWindow:
 
         try:
             # Get update plan first
+            from ..core.data_fetcher import data_fetcher
             plan = data_fetcher.get_update_plan()
 
             need_full = len(plan['symbols_needing_full_fetch'])
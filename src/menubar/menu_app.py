@@ -13,6 +13,7 @@ from ..config.settings import config
 from ..core.database_manager import db_manager
 from ..core.data_fetcher import data_fetcher
 from ..utils.logger import get_logger
+from ..utils.last_update import save_last_update
 from .notifications import NotificationManager
 
 logger = get_logger(__name__, "menubar.log")
@@ -207,10 +208,9 @@ class NiftyMenuBarApp(rumps.App):
 
             import os
             import subprocess
-            from pathlib import Path
 
             # Get the correct paths
-            app_dir = Path(__file__).parent.parent.parent
+            app_dir = config.BASE_DIR
             gui_script = app_dir / "run_gui.py"
             python_exe = app_dir / "data_env" / "bin" / "python3"
 
@@ -421,29 +421,7 @@ Logs: {config.LOGS_DIR}"""
     def save_last_update_time(self, update_time=None):
         """Save the last update time to file"""
         try:
-            import os
-            import json
-            from datetime import datetime
-            from pathlib import Path
-
-            # Get the app directory (same path as status panel)
-            app_dir = Path(__file__).parent.parent.parent
-            status_file = app_dir / 'data' / 'last_update.json'
-
-            # Ensure data directory exists
-            os.makedirs(status_file.parent, exist_ok=True)
-
-            if update_time is None:
-                update_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-            data = {
-                'last_update': update_time,
-                'timestamp': datetime.now().isoformat()
-            }
-
-            with open(status_file, 'w') as f:
-                json.dump(data, f, indent=2)
-
+            update_time = save_last_update(update_time)
             logger.info(f"Menu bar: Saved last update time: {update_time}")
 
         except Exception as e:
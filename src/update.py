@@ -0,0 +1,63 @@
+"""
+Scheduled stock data update - entry point used by run_update.py and the LaunchAgent
+"""
+
+import sys
+
+from .utils.last_update import save_last_update
+
+def save_last_update_time(update_time=None):
+    """Save the last update time to file - same as status panel"""
+    try:
+        update_time = save_last_update(update_time)
+        print(f"Saved last update time: {update_time}")
+        
+    except Exception as e:
+        print(f"Could not save last update time: {e}")
+
+def main():
+    try:
+        from .menubar.notifications import NotificationManager
+        
+        # Send start notification before the heavy imports below
+        notification_manager = NotificationManager()
+        notification_manager.show_notification(
+            "Scheduled Update Started",
+            "Weekly stock data update beginning...",
+            sound=False
+        )
+        
+        # Deferred: these pull in pandas, yfinance and sqlalchemy
+        from .core.database_manager import db_manager
+        from .core.data_fetcher import data_fetcher
+        
+        # Initialize
+        db_manager.initialize()
+        
+        # Perform update
+        success, result = data_fetcher.fetch_all_stocks_concurrent()
+        
+        if success:
+            # SAVE UPDATE TIME WHEN SUCCESSFUL
+            save_last_update_time()
+            
+            message = f"Updated {result.get('successful_fetches', 0)} stocks"
+            notification_manager.show_notification(
+                "Update Complete",
+                message,
+                sound=True
+            )
+            print(f"SUCCESS: {message}")
+        else:
+            error_msg = result.get('error', 'Unknown error')
+            notification_manager.show_notification(
+                "Update Failed",
+                f"Error: {error_msg}",
+                sound=True
+            )
+            print(f"ERROR: {error_msg}")
+            sys.exit(1)
+            
+    except Exception as e:
+        print(f"FATAL ERROR: {e}")
+        sys.exit(1)
@@ -0,0 +1,84 @@
+"""
+Shared access to data/last_update.json - the time of the last successful data update
+Written by the GUI, the menu bar app and the scheduled update script, polled by the status panel
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from ..config.settings import config
+
+# orjson is optional - a faster encoder/decoder, stdlib json is used when it isn't installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+LAST_UPDATE_FILE = config.DATA_DIR / 'last_update.json'
+
+# Last parsed file contents keyed by modification time, so repeated polling costs one stat
+_last_update_cache: Dict[str, Any] = {'mtime_ns': None, 'data': None}
+
+def load_last_update() -> Optional[Dict[str, Any]]:
+    """
+    Load last_update.json, reusing the previous parse while the file is unchanged
+
+    Returns:
+        Parsed file contents, or None if no update has been recorded yet
+    """
+    try:
+        mtime_ns = os.stat(LAST_UPDATE_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    if _last_update_cache['mtime_ns'] == mtime_ns:
+        return _last_update_cache['data']
+
+    with open(LAST_UPDATE_FILE, 'rb') as f:
+        data = _json_loads(f.read())
+
+    _last_update_cache['mtime_ns'] = mtime_ns
+    _last_update_cache['data'] = data
+    return data
+
+def save_last_update(update_time: Optional[str] = None) -> str:
+    """
+    Record a successful data update in last_update.json
+
+    Compact JSON is written to a temp file and moved into place with os.replace,
+    so an interrupted write can never leave a truncated file for readers
+
+    Args:
+        update_time: Update time string, defaults to now ('%Y-%m-%d %H:%M:%S')
+
+    Returns:
+        The update time that was saved
+    """
+    if update_time is None:
+        update_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    data = {
+        'last_update': update_time,
+        'timestamp': datetime.now().isoformat()
+    }
+
+    tmp_file = LAST_UPDATE_FILE.with_suffix('.json.tmp')
+    try:
+        f = open(tmp_file, 'wb')
+    except FileNotFoundError:
+        # Data directory missing (first run) - create it and retry
+        os.makedirs(tmp_file.parent, exist_ok=True)
+        f = open(tmp_file, 'wb')
+
+    with f:
+        f.write(_json_dumps(data))
+
+    os.replace(tmp_file, LAST_UPDATE_FILE)
+    return update_time
@@ -38,9 +38,6 @@ def setup_logging(level: str = "INFO",
                  backup_count: int = 5) -> None:
     """Setup application logging with visual indicators"""
     
-    # Create logs directory
-    config.LOGS_DIR.mkdir(parents=True, exist_ok=True)
-    
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, level.upper()))
@@ -60,10 +57,13 @@ def setup_logging(level: str = "INFO",
     if log_to_file:
         log_file = config.LOGS_DIR / "database_manager.log"
         
+        # delay=True: the file is opened on the first record, so importing this module creates nothing
+        # (the launchers create LOGS_DIR through config.ensure_directories)
         file_handler = logging.handlers.RotatingFileHandler(
             log_file,
             maxBytes=max_file_size,
-            backupCount=backup_count
+            backupCount=backup_count,
+            delay=True
         )
         
         file_formatter = logging.Formatter(
@@ -115,7 +115,8 @@ def get_logger(name: str, log_file_name: Optional[str] = None) -> logging.Logger
         custom_file_handler = logging.handlers.RotatingFileHandler(
             custom_log_file,
             maxBytes=10 * 1024 * 1024,  # 10MB
-            backupCount=5
+            backupCount=5,
+            delay=True
         )
         
         # Use same formatter as main file handler (without emoji)
@@ -0,0 +1,104 @@
+"""
+Tests for the per-symbol yfinance history cache (src/core/_yf_cache.py)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core import _yf_cache
+
+SYMBOL = 'RELIANCE.NS'
+
+def _history(start: str, end: str) -> pd.DataFrame:
+    """yfinance-style history for the business days in [start, end)"""
+    dates = pd.bdate_range(start, end, inclusive='left', tz='Asia/Kolkata', name='Date')
+    values = np.arange(len(dates), dtype=np.float64)
+    return pd.DataFrame({'Open': values, 'High': values, 'Low': values, 'Close': values,
+                         'Volume': values.astype(np.int64)}, index=dates)
+
+class FakeDownload:
+    """download(start, end) callable recording every requested window"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, start: str, end: str) -> pd.DataFrame:
+        self.calls.append((start, end))
+        return _history(start, end)
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Cache module writing to a temp directory, with 'today' controlled by set_cutoff"""
+    monkeypatch.setattr(_yf_cache, 'CACHE_DIR', tmp_path)
+
+    def set_cutoff(cutoff: str):
+        monkeypatch.setattr(_yf_cache, 'immutable_cutoff', lambda: cutoff)
+
+    set_cutoff('2024-03-01')
+    return set_cutoff
+
+def test_window_fetched_on_day_n_is_served_from_cache_on_day_n_plus_1(cache):
+    download = FakeDownload()
+
+    # Day N
+    first = _yf_cache.fetch(SYMBOL, '2024-01-01', '2024-03-01', download)
+    assert download.calls == [('2024-01-01', '2024-03-01')]
+
+    # Day N+1 - the cutoff moved on, the same window needs no download
+    cache('2024-03-02')
+    again = _yf_cache.fetch(SYMBOL, '2024-01-01', '2024-03-01', download)
+    assert download.calls == [('2024-01-01', '2024-03-01')]
+    pd.testing.assert_frame_equal(again, first, check_freq=False)
+
+def test_next_day_window_downloads_only_the_uncovered_part(cache, tmp_path):
+    download = FakeDownload()
+    _yf_cache.fetch(SYMBOL, '2024-01-01', '2024-03-01', download)
+
+    cache('2024-03-05')
+    data = _yf_cache.fetch(SYMBOL, '2024-01-01', '2024-03-05', download)
+
+    assert download.calls[1:] == [('2024-03-01', '2024-03-05')]
+    assert data.index.equals(_yf_cache.naive_dates(_history('2024-01-01', '2024-03-05')).index)
+
+    # Still a single file per symbol, now covering the merged range
+    assert [path.name for path in tmp_path.rglob('*.parquet')] == [f'{SYMBOL}.parquet']
+    assert _yf_cache.missing_range(SYMBOL, '2024-02-01', '2024-03-05') is None
+
+def test_windows_inside_the_cached_range_are_sliced(cache):
+    download = FakeDownload()
+    _yf_cache.fetch(SYMBOL, '2024-01-01', '2024-03-01', download)
+
+    data = _yf_cache.fetch(SYMBOL, '2024-02-01', '2024-02-10', download)
+
+    assert len(download.calls) == 1
+    assert data.index.min() == pd.Timestamp('2024-02-01')
+    assert data.index.max() == pd.Timestamp('2024-02-09')
+
+def test_recent_windows_are_not_cached(cache, tmp_path):
+    download = FakeDownload()
+    _yf_cache.fetch(SYMBOL, '2024-02-01', '2024-03-10', download)
+    _yf_cache.fetch(SYMBOL, '2024-02-01', '2024-03-10', download)
+
+    assert len(download.calls) == 2
+    assert not list(tmp_path.rglob('*.parquet'))
+
+def test_clear_forces_a_fresh_download(cache):
+    download = FakeDownload()
+    _yf_cache.fetch(SYMBOL, '2024-01-01', '2024-03-01', download)
+
+    _yf_cache.clear()
+    _yf_cache.fetch(SYMBOL, '2024-01-01', '2024-03-01', download)
+
+    assert len(download.calls) == 2
+
+def test_adjust_mode_is_checked_from_the_file_metadata(cache, tmp_path):
+    download = FakeDownload()
+    _yf_cache.fetch(SYMBOL, '2024-01-01', '2024-03-01', download, auto_adjust=True)
+
+    # An adjusted file in the raw location is not served as raw prices
+    raw_path = tmp_path / 'raw' / f'{SYMBOL}.parquet'
+    raw_path.parent.mkdir()
+    (tmp_path / 'adjusted' / f'{SYMBOL}.parquet').rename(raw_path)
+
+    assert _yf_cache.load(SYMBOL, '2024-01-01', '2024-03-01', auto_adjust=False) is None